@@ -11,6 +11,7 @@ class AppConfig(BaseModel):
     queue_timeout: int = 60  # Default 1 minute in seconds
     idle_timeout: int = 600  # Default 10 minutes in seconds before auto-turning off lights
     train_address: Optional[str] = None  # LionChief train BLE address
+    connection_profile: str = "balanced"  # Reconnect backoff profile: balanced or reliable
     server_host: str = "0.0.0.0"
     server_port: int = 8000
 
@@ -20,6 +21,7 @@ config = AppConfig(
     queue_timeout=int(os.getenv("TRAIN_QUEUE_TIMEOUT", "60")),
     idle_timeout=int(os.getenv("TRAIN_IDLE_TIMEOUT", "600")),
     train_address=os.getenv("TRAIN_ADDRESS"),
+    connection_profile=os.getenv("TRAIN_CONNECTION_PROFILE", "balanced"),
     server_host=os.getenv("TRAIN_SERVER_HOST", "0.0.0.0"),
     server_port=int(os.getenv("TRAIN_SERVER_PORT", "8000")),
 )
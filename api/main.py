@@ -40,7 +40,10 @@ async def lifespan(app: FastAPI):
     logger.info("Starting train queue system...")
 
     # Initialize train controller first
-    train_controller = TrainController(train_address=config.train_address)
+    train_controller = TrainController(
+        train_address=config.train_address,
+        profile=config.connection_profile
+    )
     await train_controller.initialize()
 
     # Initialize queue manager with train controller reference
@@ -374,6 +377,18 @@ async def get_train_status():
     return train_controller.get_status()
 
 
+@app.get("/status/all")
+async def get_all_status():
+    """Get train and queue status in a single call."""
+    if not queue_manager or not train_controller:
+        raise HTTPException(status_code=500, detail="System not initialized")
+
+    return {
+        "train": train_controller.get_status(),
+        "queue": queue_manager.get_queue_status()
+    }
+
+
 @app.get("/train/scan")
 async def scan_for_trains(duration: int = 10):
     """
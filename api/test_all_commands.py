@@ -6,15 +6,42 @@ Run with: python3 test_all_commands.py
 
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://localhost:8000"
 USER_ID = "comprehensive-test"
 USERNAME = "Comprehensive Tester"
 
+# Precomputed endpoint URLs and a shared keep-alive session
+URL_STATUS = f"{BASE_URL}/train/status"
+URL_SPEED = f"{BASE_URL}/train/speed"
+URL_DIRECTION = f"{BASE_URL}/train/direction"
+URL_HORN = f"{BASE_URL}/train/horn"
+URL_BELL = f"{BASE_URL}/train/bell"
+URL_STOP = f"{BASE_URL}/train/emergency-stop"
+URL_QUEUE_JOIN = f"{BASE_URL}/queue/join"
+URL_QUEUE_LEAVE = f"{BASE_URL}/queue/leave"
+URL_QUEUE_STATUS = f"{BASE_URL}/queue/status"
+
+SESSION = requests.Session()
+# Retry transient failures (server restarts, proxy hiccups) on a keep-alive pool
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"})
+    ),
+    pool_block=False
+))
+
 def join_queue():
     """Join the queue to get control"""
     print("👤 Joining queue...")
-    r = requests.post(f"{BASE_URL}/queue/join", json={"user_id": USER_ID, "username": USERNAME})
+    r = SESSION.post(URL_QUEUE_JOIN, json={"user_id": USER_ID, "username": USERNAME})
     result = r.json()
     print(f"   Response: {result}")
     print()
@@ -23,18 +50,18 @@ def join_queue():
 def leave_queue():
     """Leave the queue"""
     print("👋 Leaving queue...")
-    r = requests.post(f"{BASE_URL}/queue/leave", json={"user_id": USER_ID})
+    r = SESSION.post(URL_QUEUE_LEAVE, json={"user_id": USER_ID})
     print(f"   Response: {r.json()}")
     print()
 
 def get_queue_status():
     """Check queue status"""
-    r = requests.get(f"{BASE_URL}/queue/status")
+    r = SESSION.get(URL_QUEUE_STATUS)
     return r.json()
 
 def get_train_status():
     """Check train status"""
-    r = requests.get(f"{BASE_URL}/train/status")
+    r = SESSION.get(URL_STATUS)
     return r.json()
 
 def test_speed_range():
@@ -45,7 +72,7 @@ def test_speed_range():
 
     # Test stop
     print("🚂 Setting speed to 0 (stop)...")
-    r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 0})
+    r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 0})
     print(f"   {r.json()}")
     time.sleep(1)
 
@@ -53,13 +80,13 @@ def test_speed_range():
     print("\n--- FORWARD SPEEDS (positive values) ---")
     for speed in [10, 30, 50, 70, 100]:
         print(f"🚂 Setting speed to {speed} (forward)...")
-        r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": speed})
+        r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": speed})
         print(f"   {r.json()}")
         time.sleep(2)
 
     # Stop
     print("\n🚂 Stopping (speed 0)...")
-    r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 0})
+    r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 0})
     print(f"   {r.json()}")
     time.sleep(1)
 
@@ -67,13 +94,13 @@ def test_speed_range():
     print("\n--- REVERSE SPEEDS (negative values) ---")
     for speed in [-10, -30, -50, -70, -100]:
         print(f"🚂 Setting speed to {speed} (reverse)...")
-        r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": speed})
+        r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": speed})
         print(f"   {r.json()}")
         time.sleep(2)
 
     # Return to stop
     print("\n🚂 Final stop (speed 0)...")
-    r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 0})
+    r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 0})
     print(f"   {r.json()}")
     time.sleep(1)
 
@@ -87,7 +114,7 @@ def test_direction_control():
 
     for direction in directions:
         print(f"↔️  Setting direction to {direction}...")
-        r = requests.post(f"{BASE_URL}/train/direction", json={"user_id": USER_ID, "direction": direction})
+        r = SESSION.post(URL_DIRECTION, json={"user_id": USER_ID, "direction": direction})
         result = r.json()
         print(f"   {result}")
         time.sleep(1.5)
@@ -100,7 +127,7 @@ def test_horn():
 
     for i in range(3):
         print(f"📯 Blowing horn (attempt {i+1}/3)...")
-        r = requests.post(f"{BASE_URL}/train/horn", json={"user_id": USER_ID})
+        r = SESSION.post(URL_HORN, json={"user_id": USER_ID})
         print(f"   {r.json()}")
         time.sleep(1.5)
 
@@ -112,25 +139,25 @@ def test_bell():
 
     # Bell on
     print("🔔 Bell ON...")
-    r = requests.post(f"{BASE_URL}/train/bell", json={"user_id": USER_ID, "state": True})
+    r = SESSION.post(URL_BELL, json={"user_id": USER_ID, "state": True})
     print(f"   {r.json()}")
     time.sleep(3)
 
     # Bell off
     print("🔔 Bell OFF...")
-    r = requests.post(f"{BASE_URL}/train/bell", json={"user_id": USER_ID, "state": False})
+    r = SESSION.post(URL_BELL, json={"user_id": USER_ID, "state": False})
     print(f"   {r.json()}")
     time.sleep(1)
 
     # Bell on again
     print("🔔 Bell ON (second time)...")
-    r = requests.post(f"{BASE_URL}/train/bell", json={"user_id": USER_ID, "state": True})
+    r = SESSION.post(URL_BELL, json={"user_id": USER_ID, "state": True})
     print(f"   {r.json()}")
     time.sleep(2)
 
     # Bell off
     print("🔔 Bell OFF...")
-    r = requests.post(f"{BASE_URL}/train/bell", json={"user_id": USER_ID, "state": False})
+    r = SESSION.post(URL_BELL, json={"user_id": USER_ID, "state": False})
     print(f"   {r.json()}")
     time.sleep(1)
 
@@ -142,13 +169,13 @@ def test_emergency_stop():
 
     # Set some speed first
     print("🚂 Setting speed to 15...")
-    r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 15})
+    r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 15})
     print(f"   {r.json()}")
     time.sleep(2)
 
     # Emergency stop
     print("🛑 EMERGENCY STOP!")
-    r = requests.post(f"{BASE_URL}/train/emergency-stop", json={"user_id": USER_ID})
+    r = SESSION.post(URL_STOP, json={"user_id": USER_ID})
     print(f"   {r.json()}")
     time.sleep(1)
 
@@ -160,70 +187,70 @@ def test_combined_sequence():
 
     # Start forward, slow speed
     print("1️⃣ Setting direction forward...")
-    requests.post(f"{BASE_URL}/train/direction", json={"user_id": USER_ID, "direction": "forward"})
+    SESSION.post(URL_DIRECTION, json={"user_id": USER_ID, "direction": "forward"})
     time.sleep(1)
 
     print("2️⃣ Starting at slow speed (5)...")
-    requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 5})
+    SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 5})
     time.sleep(2)
 
     # Horn
     print("3️⃣ Blowing horn...")
-    requests.post(f"{BASE_URL}/train/horn", json={"user_id": USER_ID})
+    SESSION.post(URL_HORN, json={"user_id": USER_ID})
     time.sleep(2)
 
     # Speed up
     print("4️⃣ Accelerating to speed 12...")
-    requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 12})
+    SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 12})
     time.sleep(2)
 
     # Bell on
     print("5️⃣ Ringing bell...")
-    requests.post(f"{BASE_URL}/train/bell", json={"user_id": USER_ID, "state": True})
+    SESSION.post(URL_BELL, json={"user_id": USER_ID, "state": True})
     time.sleep(3)
 
     # Speed up more
     print("6️⃣ Accelerating to speed 18...")
-    requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 18})
+    SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 18})
     time.sleep(3)
 
     # Bell off
     print("7️⃣ Stopping bell...")
-    requests.post(f"{BASE_URL}/train/bell", json={"user_id": USER_ID, "state": False})
+    SESSION.post(URL_BELL, json={"user_id": USER_ID, "state": False})
     time.sleep(1)
 
     # Slow down
     print("8️⃣ Slowing to speed 10...")
-    requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 10})
+    SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 10})
     time.sleep(2)
 
     # Horn again
     print("9️⃣ Blowing horn...")
-    requests.post(f"{BASE_URL}/train/horn", json={"user_id": USER_ID})
+    SESSION.post(URL_HORN, json={"user_id": USER_ID})
     time.sleep(2)
 
     # Slow to stop
     print("🔟 Slowing to speed 5...")
-    requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 5})
+    SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 5})
     time.sleep(2)
 
     print("1️⃣1️⃣ Coming to a complete stop...")
-    requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 0})
+    SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 0})
     time.sleep(2)
 
     # Reverse
     print("1️⃣2️⃣ Reversing direction...")
-    requests.post(f"{BASE_URL}/train/direction", json={"user_id": USER_ID, "direction": "reverse"})
+    SESSION.post(URL_DIRECTION, json={"user_id": USER_ID, "direction": "reverse"})
     time.sleep(1)
 
     # Slow reverse
     print("1️⃣3️⃣ Moving in reverse at speed 5...")
-    requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 5})
+    SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 5})
     time.sleep(3)
 
     # Stop
     print("1️⃣4️⃣ Final stop...")
-    requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 0})
+    SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 0})
     time.sleep(1)
 
 def test_invalid_inputs():
@@ -234,31 +261,31 @@ def test_invalid_inputs():
 
     # Invalid speed (too high positive)
     print("❌ Testing invalid speed (101)...")
-    r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 101})
+    r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 101})
     print(f"   {r.status_code}: {r.json()}")
     time.sleep(1)
 
     # Invalid speed (way too high positive)
     print("❌ Testing invalid speed (150)...")
-    r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 150})
+    r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 150})
     print(f"   {r.status_code}: {r.json()}")
     time.sleep(1)
 
     # Invalid speed (too low negative)
     print("❌ Testing invalid speed (-101)...")
-    r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": -101})
+    r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": -101})
     print(f"   {r.status_code}: {r.json()}")
     time.sleep(1)
 
     # Invalid speed (way too low negative)
     print("❌ Testing invalid speed (-150)...")
-    r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": -150})
+    r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": -150})
     print(f"   {r.status_code}: {r.json()}")
     time.sleep(1)
 
     # Invalid direction
     print("❌ Testing invalid direction (sideways)...")
-    r = requests.post(f"{BASE_URL}/train/direction", json={"user_id": USER_ID, "direction": "sideways"})
+    r = SESSION.post(URL_DIRECTION, json={"user_id": USER_ID, "direction": "sideways"})
     print(f"   {r.status_code}: {r.json()}")
     time.sleep(1)
 
@@ -322,7 +349,7 @@ if __name__ == "__main__":
         print("CLEANUP")
         print("="*70)
         print("🛑 Ensuring train is stopped...")
-        requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": 0})
+        SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": 0})
         time.sleep(1)
 
         # Leave queue
@@ -2,92 +2,162 @@
 """
 Test script for LionChief Train Queue API
 Run with: python3 test_api.py
+Set TEST_VERBOSE=1 to print full response bodies
 """
 
+import os
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://localhost:8000"
 USER_ID = "test-user"
 USERNAME = "Test User"
 
+VERBOSE = os.environ.get("TEST_VERBOSE") == "1"
+
+# Precomputed endpoint URLs and a shared keep-alive session
+URL_STATUS = f"{BASE_URL}/train/status"
+URL_STATUS_ALL = f"{BASE_URL}/status/all"
+URL_SCAN = f"{BASE_URL}/train/scan"
+URL_CONNECT = f"{BASE_URL}/train/connect"
+URL_SPEED = f"{BASE_URL}/train/speed"
+URL_DIRECTION = f"{BASE_URL}/train/direction"
+URL_HORN = f"{BASE_URL}/train/horn"
+URL_BELL = f"{BASE_URL}/train/bell"
+URL_STOP = f"{BASE_URL}/train/emergency-stop"
+URL_QUEUE_JOIN = f"{BASE_URL}/queue/join"
+URL_QUEUE_LEAVE = f"{BASE_URL}/queue/leave"
+URL_QUEUE_STATUS = f"{BASE_URL}/queue/status"
+
+SESSION = requests.Session()
+# Retry transient failures (server restarts, proxy hiccups) on a keep-alive pool
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"})
+    ),
+    pool_block=False
+))
+
+def report(r, label="Response"):
+    """Print the response body in verbose mode, otherwise just the status code"""
+    if VERBOSE:
+        print(f"   {label}: {r.json()}")
+    else:
+        print(f"   {label}: HTTP {r.status_code}")
+
+def wait_until(pred, timeout=3.0, interval=0.05):
+    """Poll pred() with a short interval until it returns True or timeout expires"""
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < timeout:
+        if pred():
+            return True
+        time.sleep(interval)
+    return False
+
+def train_status():
+    """Fetch the current train status"""
+    return SESSION.get(URL_STATUS).json()
+
+def controller_is(user_id):
+    """Check whether user_id currently has control"""
+    return SESSION.get(URL_QUEUE_STATUS).json().get("current_controller") == user_id
+
 def join_queue():
     """Join the queue to get control"""
     print("👤 Joining queue...")
-    r = requests.post(f"{BASE_URL}/queue/join", json={"user_id": USER_ID, "username": USERNAME})
-    print(f"   Response: {r.json()}")
+    r = SESSION.post(URL_QUEUE_JOIN, json={"user_id": USER_ID, "username": USERNAME})
+    report(r)
     print()
-    return r.json()
+    return r.ok
 
 def leave_queue():
     """Leave the queue"""
     print("👋 Leaving queue...")
-    r = requests.post(f"{BASE_URL}/queue/leave", json={"user_id": USER_ID})
-    print(f"   Response: {r.json()}")
+    r = SESSION.post(URL_QUEUE_LEAVE, json={"user_id": USER_ID})
+    report(r)
     print()
 
 def test_queue_status():
     """Check queue status"""
     print("📋 Checking queue status...")
-    r = requests.get(f"{BASE_URL}/queue/status")
-    print(f"   Status: {r.json()}")
+    r = SESSION.get(URL_QUEUE_STATUS)
+    report(r, "Status")
     print()
 
 def test_status():
     """Check train status"""
     print("📊 Checking train status...")
-    r = requests.get(f"{BASE_URL}/train/status")
-    print(f"   Status: {r.json()}")
+    r = SESSION.get(URL_STATUS)
+    report(r, "Status")
+    print()
+
+def test_all_status():
+    """Check train and queue status in one request"""
+    print("📊 Checking train and queue status...")
+    r = SESSION.get(URL_STATUS_ALL)
+    if VERBOSE:
+        data = r.json()
+        print(f"   Train: {data.get('train')}")
+        print(f"   Queue: {data.get('queue')}")
+    else:
+        print(f"   Status: HTTP {r.status_code}")
     print()
 
 def test_discovery():
     """Scan for trains"""
     print("🔍 Scanning for trains...")
-    r = requests.get(f"{BASE_URL}/train/scan", params={"duration": 10})
-    print(f"   Response: {r.json()}")
+    r = SESSION.get(URL_SCAN, params={"duration": 10})
+    report(r)
     print()
 
 def test_connect(address=None):
     """Connect to train"""
     print(f"🔌 Connecting to train{' at ' + address if address else ''}...")
     data = {"address": address} if address else {}
-    r = requests.post(f"{BASE_URL}/train/connect", json=data)
-    print(f"   Response: {r.json()}")
+    r = SESSION.post(URL_CONNECT, json=data)
+    report(r)
     print()
 
 def test_speed(speed):
     """Set train speed (-100 to 100, positive=forward, negative=reverse)"""
     print(f"🚂 Setting speed to {speed}...")
-    r = requests.post(f"{BASE_URL}/train/speed", json={"user_id": USER_ID, "speed": speed})
-    print(f"   Response: {r.json()}")
+    r = SESSION.post(URL_SPEED, json={"user_id": USER_ID, "speed": speed})
+    report(r)
     print()
 
 def test_direction(direction):
     """Set direction (forward/reverse/toggle)"""
     print(f"↔️  Setting direction to {direction}...")
-    r = requests.post(f"{BASE_URL}/train/direction", json={"user_id": USER_ID, "direction": direction})
-    print(f"   Response: {r.json()}")
+    r = SESSION.post(URL_DIRECTION, json={"user_id": USER_ID, "direction": direction})
+    report(r)
     print()
 
 def test_horn():
     """Blow the horn"""
     print("📯 Blowing horn...")
-    r = requests.post(f"{BASE_URL}/train/horn", json={"user_id": USER_ID})
-    print(f"   Response: {r.json()}")
+    r = SESSION.post(URL_HORN, json={"user_id": USER_ID})
+    report(r)
     print()
 
 def test_bell(state):
     """Ring the bell"""
     print(f"🔔 Bell {'ON' if state else 'OFF'}...")
-    r = requests.post(f"{BASE_URL}/train/bell", json={"user_id": USER_ID, "state": state})
-    print(f"   Response: {r.json()}")
+    r = SESSION.post(URL_BELL, json={"user_id": USER_ID, "state": state})
+    report(r)
     print()
 
 def test_stop():
     """Emergency stop"""
     print("🛑 Emergency stop...")
-    r = requests.post(f"{BASE_URL}/train/emergency-stop", json={"user_id": USER_ID})
-    print(f"   Response: {r.json()}")
+    r = SESSION.post(URL_STOP, json={"user_id": USER_ID})
+    report(r)
     print()
 
 if __name__ == "__main__":
@@ -97,32 +167,29 @@ if __name__ == "__main__":
     print()
 
     # Check status
-    test_status()
-    test_queue_status()
+    test_all_status()
 
     # Join queue to get control
     join_queue()
-    time.sleep(1)
+    wait_until(lambda: controller_is(USER_ID))
 
     # Test basic controls (will work in mock mode or with real train)
     test_speed(10)
-    time.sleep(1)
+    wait_until(lambda: train_status().get("speed") == 10)
 
     test_horn()
-    time.sleep(1)
 
     test_bell(True)
-    time.sleep(2)
     test_bell(False)
 
     test_direction("forward")
-    time.sleep(1)
+    wait_until(lambda: train_status().get("direction") == "forward")
 
     test_speed(15)
-    time.sleep(2)
+    wait_until(lambda: train_status().get("speed") == 15)
 
     test_stop()
-    time.sleep(1)
+    wait_until(lambda: train_status().get("speed") == 0)
 
     # Leave queue
     leave_queue()
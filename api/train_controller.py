@@ -1,183 +1,392 @@
 """Train controller interface using pyLionChief."""
 import asyncio
-from typing import Optional, Dict, List
+import functools
+from enum import IntEnum
+import importlib
+import importlib.util
+from types import MappingProxyType
+from typing import Optional, Dict, List, Mapping
 import logging
+import random
 import time
 
 logger = logging.getLogger(__name__)
 
 
+def _load_pylionchief():
+    """Resolve pyLionChief's connection class and discovery function once at import."""
+    if importlib.util.find_spec("lionchief") is None:
+        return None, None
+    try:
+        connection = importlib.import_module("lionchief.connection")
+    except ImportError as e:
+        logger.warning("pyLionChief found but could not be loaded: %s", e)
+        return None, None
+    return connection.LionChiefConnection, connection.discover_trains
+
+
+# pyLionChief entry points (None when the library is unavailable)
+_ENGINE_CLS, _DISCOVER_FN = _load_pylionchief()
+_HAS_LIONCHIEF = _ENGINE_CLS is not None
+
+# Reconnect delays in seconds per connection profile, indexed by consecutive
+# failures; the last entry repeats once the table runs out
+_RETRY_PROFILES = {
+    "balanced": (1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 60.0),
+    "reliable": (0.5, 1.0, 2.0, 4.0, 8.0, 15.0),
+}
+
+
+class Dir(IntEnum):
+    """Train direction; values index TrainController._DIRECTIONS."""
+    FORWARD = 0
+    REVERSE = 1
+
+
+def _train_command(fn):
+    """
+    Decorator for user-facing train commands.
+
+    Records user activity, passes live=True to the wrapped method when a healthy
+    connection is available (False means mock mode), and turns errors into an
+    error response. Only a failed BLE write marks the train disconnected, and
+    _submit does that, so a bad argument never drops a healthy link.
+    """
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        self._last_command_time = time.monotonic()
+        try:
+            return await fn(self, self._health and self.connected, *args, **kwargs)
+        except Exception as e:
+            logger.error("Error in %s: %s", fn.__name__, e)
+            return {"success": False, "message": str(e)}
+    return wrapper
+
+
 class TrainController:
     """Controls the LionChief train."""
 
-    def __init__(self, train_address: Optional[str] = None):
+    # Fixed-shape success responses, shared read-only rather than rebuilt per
+    # call. Bell and lights are indexed by the requested bool state.
+    _HORN_OK = MappingProxyType({"success": True, "message": "Horn blown"})
+    _STOP_OK = MappingProxyType({"success": True, "message": "Emergency stop activated"})
+    _BELL_OK = (
+        MappingProxyType({"success": True, "message": "Bell off", "bell_state": False}),
+        MappingProxyType({"success": True, "message": "Bell on", "bell_state": True}),
+    )
+    _LIGHTS_OK = (
+        MappingProxyType({"success": True, "message": "Lights off", "lights_state": False}),
+        MappingProxyType({"success": True, "message": "Lights on", "lights_state": True}),
+    )
+    # Commands that apply() may dispatch, with the types of their positional
+    # arguments; those in _FORCEABLE also take an optional trailing bool 'force'
+    _COMMANDS = MappingProxyType({
+        "set_speed": (int,),
+        "set_direction": (str,),
+        "blow_horn": (),
+        "ring_bell": (bool,),
+        "set_lights": (bool,),
+        "emergency_stop": (),
+    })
+    _FORCEABLE = frozenset({"set_speed", "set_direction", "ring_bell", "set_lights"})
+
+    # Command kinds where only the latest of back-to-back queued writes matters
+    _COALESCED = frozenset({"speed", "lights", "bell"})
+
+    # API strings for each Dir, and the reverse mapping for requests
+    _DIRECTIONS = ("forward", "reverse")
+    _DIR_MAP = {"forward": Dir.FORWARD, "reverse": Dir.REVERSE}
+    _DIRECTION_OK = (
+        MappingProxyType({"success": True, "message": "Direction set to forward", "direction": "forward"}),
+        MappingProxyType({"success": True, "message": "Direction set to reverse", "direction": "reverse"}),
+    )
+
+    def __init__(self, train_address: Optional[str] = None, profile: str = "balanced"):
+        if profile not in _RETRY_PROFILES:
+            raise ValueError(f"Unknown connection profile: {profile}")
+
+        # Status snapshot kept current by the mutators, so polling get_status
+        # doesn't rebuild it on every call
+        self._status = {
+            "connected": False,
+            "speed": 0,
+            "direction": "forward",
+            "mock_mode": True,
+            "train_address": train_address,
+            "discovered_trains": 0
+        }
+        self._status_view = MappingProxyType(self._status)  # Read-only view handed to callers
         self.train_address = train_address
-        self.train = None
+        self._train = None
         self.connected = False
-        self._lock = asyncio.Lock()
+        self._command_lock = asyncio.Lock()  # Held by the writer around each BLE command
+        self._write_lock = asyncio.Lock()  # Serializes connect/disconnect (train, train_address)
         self._current_speed = 0
-        self._current_direction = "forward"
-        self._discovered_trains: List[Dict] = []
+        self._dir = Dir.FORWARD
+        self._discovered_trains: Dict[str, Dict] = {}  # Keyed by BLE address
         self._scanning = False
         self._connection_task: Optional[asyncio.Task] = None
         self._should_reconnect = True
         self._last_command_time = 0  # Track when we last sent a command
+        self._reuse_window = 25.0  # Seconds of command-free link before a keepalive is sent
         self._disconnect_detected = False  # Flag for voluntary disconnects
+        self._attempt = 0  # Consecutive failed connection attempts
+        self._retry_delays = _RETRY_PROFILES[profile]
+        self._wakeup = asyncio.Event()  # Interrupts retry/health-check waits
+        self._link_poll_interval = 1.0  # Seconds between BLE link-state checks while connected
+        self._health = False  # Cached BLE liveness, refreshed by the connection loop
+        self._cmd_queue: asyncio.Queue = asyncio.Queue()  # Pending BLE commands
+        self._worker_task: Optional[asyncio.Task] = None
+        self._set_lights_fn = None  # Bound lights method of the connected train, if any
+        self._inner = None  # BLE client exposing is_connected, resolved at connect time
+        self._horn_off_task: Optional[asyncio.Task] = None  # Pending horn release
+        self._sent: Dict[str, object] = {}  # Last state written per command kind, this connection only
+
+    @property
+    def connected(self) -> bool:
+        """Whether the controller believes it has a live train connection."""
+        return self._status["connected"]
+
+    @connected.setter
+    def connected(self, value: bool):
+        self._status["connected"] = value
+
+    @property
+    def train(self):
+        """The pyLionChief connection, or None in mock mode."""
+        return self._train
+
+    @train.setter
+    def train(self, value):
+        self._train = value
+        self._inner = None  # Re-resolved by _bind_train for a new connection
+        self._status["mock_mode"] = value is None
 
     async def initialize(self):
         """Initialize connection to the train with automatic retry."""
         # Check if pyLionChief is available
-        try:
-            from lionchief.connection import LionChiefConnection
-        except ImportError:
+        if not _HAS_LIONCHIEF:
             logger.warning("pyLionChief not available, running in mock mode")
             self.train = None
             return
 
-        # Start the connection retry loop in the background
-        self._connection_task = asyncio.create_task(self._connection_loop())
+        # Start the BLE command writer and the connection retry loop in the background
+        self._connection_task = asyncio.create_task(self._run_manager())
         logger.info("Train connection manager started")
 
+    async def _run_manager(self):
+        """Run the connection loop and BLE writer as one task group; cancelling it stops both."""
+        async with asyncio.TaskGroup() as tg:
+            if self._worker_task is None or self._worker_task.done():
+                self._worker_task = tg.create_task(self._command_worker())
+            tg.create_task(self._connection_loop())
+
     async def _connection_loop(self):
         """Continuously try to connect to the train and maintain connection health."""
-        base_retry_delay = 30  # base seconds between retry attempts
-        max_retry_delay = 120  # maximum retry delay
-        current_retry_delay = base_retry_delay
         health_check_interval = 15  # seconds between health checks when connected
-        keepalive_interval = 25  # seconds between keepalive messages
 
         last_keepalive = 0
-        consecutive_failures = 0
+        retry_delay = self._retry_delays[0]
 
         while self._should_reconnect:
             if not self.connected:
                 # Clean up any existing connection before reconnecting
-                if self.train:
-                    try:
-                        await self.train.disconnect()
-                    except Exception:
-                        pass
-                    self.train = None
+                async with self._write_lock:
+                    if self.train and not self.connected:
+                        try:
+                            await self.train.disconnect()
+                        except Exception:
+                            pass
+                        self.train = None
 
                 try:
                     await self._attempt_connection()
-                    consecutive_failures = 0
-                    current_retry_delay = base_retry_delay
-                    last_keepalive = time.time()  # Reset keepalive timer on successful connection
                 except Exception as e:
-                    consecutive_failures += 1
-                    logger.error(f"Connection attempt failed (attempt {consecutive_failures}): {e}")
+                    logger.error("Connection attempt failed (attempt %d): %s", self._attempt + 1, e)
 
-                    # Exponential backoff with cap
-                    current_retry_delay = min(base_retry_delay * (1.5 ** min(consecutive_failures - 1, 3)), max_retry_delay)
-                    logger.info(f"Will retry in {current_retry_delay:.1f} seconds...")
+                if self.connected:
+                    self._attempt = 0
+                    last_keepalive = time.monotonic()  # Reset keepalive timer on successful connection
+                else:
+                    retry_delay = self._next_retry_delay()
+                    logger.info("Will retry in %.1f seconds...", retry_delay)
 
             # Wait before next check
             if not self.connected:
-                await asyncio.sleep(current_retry_delay)
+                await self._wait(retry_delay)
             else:
-                # Check connection health more frequently when connected
-                await asyncio.sleep(health_check_interval)
+                # Check connection health more frequently when connected; a
+                # dropped link cuts the wait short so it is reconnected promptly
+                await self._wait_while_linked(health_check_interval)
 
                 # Check if connection is still alive
                 if self.train and self.connected:
                     try:
-                        # Check the actual BLE connection status
-                        if hasattr(self.train, 'train') and hasattr(self.train.train, 'is_connected'):
-                            if not self.train.train.is_connected:
-                                logger.warning("BLE connection lost (train voluntarily disconnected)")
-                                self.connected = False
-                                self._disconnect_detected = True
-                                self.train = None
-                                continue
-
-                        current_time = time.time()
-
-                        # Always send keepalive to prevent train from making reconnection noises
+                        # Check the actual BLE connection status and refresh the
+                        # cached health flag that command methods read
+                        self._health = self._verify_connection()
+                        if not self._health:
+                            logger.warning("BLE connection lost (train voluntarily disconnected)")
+                            self._disconnect_detected = True
+                            self.train = None
+                            continue
+
+                        current_time = time.monotonic()
+
+                        # Send keepalive to prevent train from making reconnection noises.
+                        # Any user command already keeps the link busy, so only send one
+                        # once the connection has been idle for the whole reuse window.
                         # Only send when train is moving to avoid affecting stopped state
-                        if current_time - last_keepalive > keepalive_interval:
+                        last_traffic = max(last_keepalive, self._last_command_time)
+                        if current_time - last_traffic > self._reuse_window:
                             if self._current_speed > 0:
-                                # Send current speed to maintain connection
-                                await self.train.motor.set_speed(self._current_speed)
-                                logger.debug(f"Keepalive sent (speed={self._current_speed})")
+                                # Send current speed to maintain connection. It goes through
+                                # the writer like any command, so it can't split a direction
+                                # and speed pair; a failure raises here and triggers reconnect
+                                await self._submit("keepalive", self._send_keepalive)
+                                logger.debug("Keepalive sent (speed=%d)", self._current_speed)
                                 last_keepalive = current_time
 
                     except Exception as e:
-                        logger.warning(f"Connection health check failed: {e}, will attempt reconnect")
+                        logger.warning("Connection health check failed: %s, will attempt reconnect", e)
                         self.connected = False
+                        self._health = False
                         self._disconnect_detected = True
                         self.train = None
 
+    def _next_retry_delay(self) -> float:
+        """Backoff from the profile's delay table with +/-50% jitter, so restarted clients don't retry in lockstep."""
+        delay = self._retry_delays[min(self._attempt, len(self._retry_delays) - 1)]
+        self._attempt += 1
+        return delay * (1 + random.uniform(-0.5, 0.5))
+
+    async def _wait(self, timeout: float) -> bool:
+        """Sleep for up to timeout seconds, returning early (True) if _wakeup is set."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            woken = True
+        except asyncio.TimeoutError:
+            woken = False
+        self._wakeup.clear()
+        return woken
+
+    async def _wait_while_linked(self, timeout: float):
+        """
+        Sleep for up to timeout seconds while connected, returning early if
+        _wakeup is set or the BLE client reports the link down.
+
+        bleak 1.x has no set_disconnected_callback on the client pyLionChief
+        builds, so the disconnect callback never fires; polling is_connected
+        is what notices a dropped link between health checks.
+        """
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            if await self._wait(min(self._link_poll_interval, remaining)):
+                return
+            inner = self._inner
+            try:
+                if inner is not None and not inner.is_connected:
+                    return
+            except Exception:
+                return  # Let the health check below sort it out
+
     def _on_disconnect_callback(self, client):
         """Callback when BLE connection is lost."""
-        logger.warning(f"BLE disconnection detected for {client.address}")
+        logger.warning("BLE disconnection detected for %s", client.address)
         self.connected = False
-        # The connection loop will automatically attempt to reconnect
+        self._health = False
+        # Wake the connection loop so it reconnects now instead of after the
+        # current health-check interval
+        self._wakeup.set()
 
     async def _attempt_connection(self):
         """Attempt to connect to a train (either specified address or discovered)."""
-        try:
-            from lionchief.connection import LionChiefConnection
-        except ImportError:
+        if not _HAS_LIONCHIEF:
             logger.error("pyLionChief not available")
             return
 
         try:
             if self.train_address:
                 # Connect to specified address
-                logger.info(f"Attempting to connect to train at {self.train_address}...")
-                # LionChiefConnection expects (profile, manufacturer_data)
-                # For direct connection, we use address as profile and empty dict for manufacturer_data
-                self.train = LionChiefConnection(self.train_address, {})
-                await self.train.connect()
-
-                # Register disconnect callback if possible
-                if hasattr(self.train, 'train') and hasattr(self.train.train, 'set_disconnected_callback'):
-                    self.train.train.set_disconnected_callback(self._on_disconnect_callback)
-                    logger.debug("Disconnect callback registered")
-
-                self.connected = True
-                logger.info(f"✓ Successfully connected to train at {self.train_address}")
+                address = name = self.train_address
+                logger.info("Attempting to connect to train at %s...", address)
             else:
                 # Discover and connect to first available
                 logger.info("No train address specified, scanning for trains...")
                 discovered = await self.scan_for_trains()
 
-                if discovered:
-                    first_train = discovered[0]
-                    logger.info(f"Found train: {first_train['name']} ({first_train['address']})")
-                    logger.info(f"Attempting to connect...")
-
-                    self.train_address = first_train['address']
-                    # discovered trains are already LionChiefConnection objects
-                    self.train = first_train['connection']
-                    await self.train.connect()
-
-                    # Register disconnect callback if possible
-                    if hasattr(self.train, 'train') and hasattr(self.train.train, 'set_disconnected_callback'):
-                        self.train.train.set_disconnected_callback(self._on_disconnect_callback)
-                        logger.debug("Disconnect callback registered")
-
-                    self.connected = True
-                    logger.info(f"✓ Successfully connected to {first_train['name']}")
-                else:
+                if not discovered:
                     logger.warning("No trains discovered during scan")
+                    return
+                first_train = discovered[0]
+                address, name = first_train['address'], first_train['name']
+                logger.info("Found train: %s (%s)", name, address)
+                logger.info("Attempting to connect...")
+
+            # Same lock as connect_to_train, so a manual connect and this retry
+            # can't both build a client and bind the wrong one
+            async with self._write_lock:
+                if self.connected:
+                    return  # A manual connect got there first
+                self.train_address = address
+                self._status["train_address"] = address
+                # LionChiefConnection expects (profile, manufacturer_data)
+                # For direct connection, we use address as profile and empty dict for manufacturer_data
+                self.train = _ENGINE_CLS(address, {})
+                try:
+                    await self.train.connect()
+                except Exception:
+                    self.train = None
+                    self.connected = False
+                    self._health = False
+                    raise
+                self._bind_train()
+            logger.info("✓ Successfully connected to %s", name)
 
         except Exception as e:
-            logger.error(f"Connection failed: {e}")
-            self.train = None
-            self.connected = False
+            logger.error("Connection failed: %s", e)
             raise
 
+    def _bind_train(self):
+        """Per-connection setup, run once self.train.connect() has succeeded."""
+        inner = getattr(self.train, 'train', None)
+
+        # Register disconnect callback if possible (bleak 1.x clients don't offer
+        # this; _wait_while_linked polls is_connected instead)
+        if hasattr(inner, 'set_disconnected_callback'):
+            inner.set_disconnected_callback(self._on_disconnect_callback)
+            logger.debug("Disconnect callback registered")
+
+        # Keep the BLE client around for health checks if it reports link state
+        self._inner = inner if hasattr(inner, 'is_connected') else None
+
+        # Resolve the lights method once rather than on every toggle
+        self._set_lights_fn = getattr(getattr(self.train, 'lighting', None), 'set_lights', None)
+
+        # The train's state is unknown on a fresh connection, so nothing counts as a no-op yet
+        self._sent.clear()
+        self._cancel_horn_off()
+
+        self.connected = True
+        self._health = True
+
     async def stop_connection_manager(self):
         """Stop the connection retry loop."""
         self._should_reconnect = False
+        self._wakeup.set()
+        self._cancel_horn_off()
         if self._connection_task and not self._connection_task.done():
             self._connection_task.cancel()
             try:
                 await self._connection_task
             except asyncio.CancelledError:
                 pass
+        if self._worker_task and not self._worker_task.done():
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
         logger.info("Train connection manager stopped")
 
     def _verify_connection(self) -> bool:
@@ -191,248 +400,359 @@ class TrainController:
 
         # Check actual BLE connection status
         try:
-            if hasattr(self.train, 'train') and hasattr(self.train.train, 'is_connected'):
-                if not self.train.train.is_connected:
-                    logger.warning("Connection verification failed: BLE not connected")
-                    self.connected = False
-                    return False
+            if self._inner is not None and not self._inner.is_connected:
+                logger.warning("Connection verification failed: BLE not connected")
+                self.connected = False
+                return False
             return True
         except Exception as e:
-            logger.warning(f"Connection verification failed: {e}")
+            logger.warning("Connection verification failed: %s", e)
             self.connected = False
             return False
 
-    async def set_speed(self, speed: int) -> Dict:
+    def _ensure_worker(self):
+        """Start the BLE command writer task if it is not already running."""
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._command_worker())
+
+    def _enqueue(self, kind: str, action, fut: Optional[asyncio.Future] = None):
+        """Queue a BLE command for the writer task without waiting for it."""
+        self._ensure_worker()
+        self._cmd_queue.put_nowait((kind, action, fut))
+
+    async def _submit(self, kind: str, action):
+        """
+        Queue a BLE command for the writer task and wait until it has been sent.
+        A failed write marks the train disconnected before the error is re-raised.
+        """
+        fut = asyncio.get_running_loop().create_future()
+        self._enqueue(kind, action, fut)
+        try:
+            await fut
+        except Exception:
+            self.connected = False
+            raise
+
+    async def _command_worker(self):
+        """
+        Single writer for all BLE commands.
+
+        Drains whatever is queued in one pass and sends it in order. A speed,
+        lights or bell command immediately followed by another of the same kind
+        is dropped, so a burst of slider events or rapid taps only writes the
+        latest value.
+        """
+        batch = []
+        try:
+            while True:
+                batch = [await self._cmd_queue.get()]
+                while not self._cmd_queue.empty():
+                    batch.append(self._cmd_queue.get_nowait())
+
+                for i, (kind, action, fut) in enumerate(batch):
+                    if kind in self._COALESCED and i + 1 < len(batch) and batch[i + 1][0] == kind:
+                        # Superseded by the next queued command of the same kind
+                        if fut is not None and not fut.done():
+                            fut.set_result(None)
+                        continue
+
+                    try:
+                        async with self._command_lock:
+                            await action()
+                    except Exception as e:
+                        if fut is None:
+                            logger.error("Error setting %s: %s", kind, e)
+                            self.connected = False  # Mark as disconnected on error
+                        elif not fut.done():
+                            fut.set_exception(e)
+                    else:
+                        if fut is not None and not fut.done():
+                            fut.set_result(None)
+                batch = []
+        except asyncio.CancelledError:
+            for _, _, fut in batch:
+                if fut is not None and not fut.done():
+                    fut.cancel()
+            raise
+
+    async def _send_speed(self, direction: Optional[Dir], speed: int):
+        """Send direction (if any) then speed to the motor."""
+        if direction is not None:
+            await self.train.motor.set_movement_direction(direction is Dir.FORWARD)
+        await self.train.motor.set_speed(speed)
+
+    def _forget_sent(self, kind: str, value):
+        """After a failed write the train's state is unknown; drop the entry unless a newer command replaced it."""
+        if self._sent.get(kind) == value:
+            del self._sent[kind]
+
+    async def _send_keepalive(self):
+        """Resend the current speed; read when the writer runs it, so it is never stale."""
+        await self.train.motor.set_speed(self._current_speed)
+
+    async def _horn_off_after(self, delay: float):
+        """Queue the horn release after delay, without holding up the command writer."""
+        await asyncio.sleep(delay)
+        self._horn_off_task = None
+        if self.train is not None:
+            # Resolved when the writer runs it, so it targets the connection in use then
+            self._enqueue("horn", lambda: self.train.sound.set_horn(False))
+
+    def _cancel_horn_off(self):
+        """Drop a pending horn release (on shutdown, or when it belongs to an old connection)."""
+        if self._horn_off_task is not None:
+            self._horn_off_task.cancel()
+            self._horn_off_task = None
+
+    async def _cleanup_train(self):
+        """Stop the train and silence the bell and horn."""
+        await self.train.motor.stop()
+        await self.train.sound.set_bell(False)
+        await self.train.sound.set_horn(False)
+
+    @_train_command
+    async def set_speed(self, live: bool, speed: int, force: bool = False) -> Dict:
         """
         Set train speed (-100 to 100).
 
         Negative values force reverse direction.
         Positive values use current direction (set via set_direction or previous negative speed).
         Zero stops without changing direction.
+        Repeating the last speed sent on this connection skips the BLE write unless force is set.
 
         Examples:
             speed -50  → reverse at 50
             direction reverse, then speed 50 → reverse at 50
             speed 50 (when already forward) → forward at 50
         """
-        async with self._lock:
+        if not -100 <= speed <= 100:
+            return {"success": False, "message": "Speed must be between -100 and 100"}
+
+        # Determine direction and actual speed
+        if speed < 0:
+            # Negative speed forces reverse direction
+            direction = Dir.REVERSE
+            actual_speed = -speed
+        elif speed > 0:
+            # Positive speed uses current direction
+            direction = self._dir
+            actual_speed = speed
+        else:  # speed == 0
+            # Stop without changing direction
+            actual_speed = 0
+            direction = None
+
+        # Update state before the BLE write so status polls see it right away;
+        # reverted below if the write fails
+        old_speed, old_dir = self._current_speed, self._dir
+        if speed < 0:  # Only update stored direction for negative speeds
+            self._dir = Dir.REVERSE
+            self._status["direction"] = "reverse"
+        self._current_speed = actual_speed  # Store absolute value
+        self._status["speed"] = actual_speed
+
+        if not live:
+            logger.info("Mock: Setting speed to %d (%s)", speed,
+                        "stop" if direction is None else self._DIRECTIONS[direction])
+        elif force or self._sent.get("speed") != (direction, actual_speed):
+            # Recorded before the write so a command queued meanwhile isn't
+            # overwritten with a stale value. The writer still coalesces bursts;
+            # a superseded write resolves as sent.
+            sent = (direction, actual_speed)
+            self._sent["speed"] = sent
+            if direction is not None:
+                self._sent["direction"] = direction
             try:
-                if speed < -100 or speed > 100:
-                    return {"success": False, "message": "Speed must be between -100 and 100"}
-
-                # Track user activity
-                self._last_command_time = time.time()
-
-                # Determine direction and actual speed
-                if speed < 0:
-                    # Negative speed forces reverse direction
-                    direction = "reverse"
-                    actual_speed = abs(speed)
-                elif speed > 0:
-                    # Positive speed uses current direction
-                    direction = self._current_direction
-                    actual_speed = speed
-                else:  # speed == 0
-                    # Stop without changing direction
-                    actual_speed = 0
-                    direction = None
-
-                # Verify connection before sending command
-                if self._verify_connection():
-                    # Set direction if needed (skip for speed 0)
-                    if direction:
-                        await self.train.motor.set_movement_direction(direction == "forward")
-                        if speed < 0:  # Only update stored direction for negative speeds
-                            self._current_direction = direction
-
-                    # Set the actual speed
-                    await self.train.motor.set_speed(actual_speed)
-                else:
-                    logger.info(f"Mock: Setting speed to {speed} ({direction if direction else 'stop'})")
-                    if speed < 0:  # Update stored direction for negative speeds in mock mode too
-                        self._current_direction = direction
+                await self._submit("speed", lambda: self._send_speed(direction, actual_speed))
+            except Exception:
+                self._forget_sent("speed", sent)
+                if direction is not None:
+                    self._forget_sent("direction", direction)
+                # Leave state alone if a later command changed it
+                if self._current_speed == actual_speed:
+                    self._current_speed = old_speed
+                    self._status["speed"] = old_speed
+                if speed < 0 and self._dir == Dir.REVERSE:
+                    self._dir = old_dir
+                    self._status["direction"] = self._DIRECTIONS[old_dir]
+                raise
 
-                self._current_speed = actual_speed  # Store absolute value
-                return {
-                    "success": True,
-                    "message": f"Speed set to {speed}",
-                    "speed": speed
-                }
-            except Exception as e:
-                logger.error(f"Error setting speed: {e}")
-                self.connected = False  # Mark as disconnected on error
-                return {"success": False, "message": str(e)}
+        return {
+            "success": True,
+            "message": f"Speed set to {speed}",
+            "speed": speed
+        }
 
-    async def set_direction(self, direction: str) -> Dict:
-        """Set train direction (forward/reverse/toggle)."""
-        async with self._lock:
+    @_train_command
+    async def set_direction(self, live: bool, direction: str, force: bool = False) -> Mapping:
+        """Set train direction (forward/reverse/toggle); a no-op write is skipped unless force is set."""
+        if direction not in ["forward", "reverse", "toggle"]:
+            return {
+                "success": False,
+                "message": "Direction must be 'forward', 'reverse', or 'toggle'"
+            }
+
+        if direction == "toggle":
+            new_dir = Dir(self._dir ^ 1)
+        else:
+            new_dir = self._DIR_MAP[direction]
+
+        # Update state before the BLE write so status polls see it right away;
+        # reverted below if the write fails
+        old_dir = self._dir
+        self._dir = new_dir
+        self._status["direction"] = self._DIRECTIONS[new_dir]
+
+        if not live:
+            logger.info("Mock: Setting direction to %s", direction)
+        elif force or self._sent.get("direction") is not new_dir:
+            speed = self._current_speed
+            # Recorded before the write, as in set_speed, so a command queued
+            # while this one is in flight isn't overwritten with a stale value
+            self._sent["direction"] = new_dir
+            if speed > 0:
+                self._sent["speed"] = (new_dir, speed)
             try:
-                if direction not in ["forward", "reverse", "toggle"]:
-                    return {
-                        "success": False,
-                        "message": "Direction must be 'forward', 'reverse', or 'toggle'"
-                    }
-
-                # Track user activity
-                self._last_command_time = time.time()
-
-                # Verify connection before sending command
-                if self._verify_connection():
-                    if direction == "toggle":
-                        new_direction = "reverse" if self._current_direction == "forward" else "forward"
-                        await self.train.motor.set_movement_direction(new_direction == "forward")
-                        self._current_direction = new_direction
-                    elif direction == "forward":
-                        await self.train.motor.set_movement_direction(True)
-                        self._current_direction = "forward"
-                    else:  # reverse
-                        await self.train.motor.set_movement_direction(False)
-                        self._current_direction = "reverse"
+                if speed > 0:
+                    # Moving: send direction and the speed to resume at as one
+                    # writer action, so nothing else is queued between them
+                    await self._submit("direction", lambda: self._send_speed(new_dir, speed))
                 else:
-                    logger.info(f"Mock: Setting direction to {direction}")
-                    if direction == "toggle":
-                        self._current_direction = "reverse" if self._current_direction == "forward" else "forward"
-                    else:
-                        self._current_direction = direction
-
-                return {
-                    "success": True,
-                    "message": f"Direction set to {self._current_direction}",
-                    "direction": self._current_direction
-                }
-            except Exception as e:
-                logger.error(f"Error setting direction: {e}")
-                self.connected = False  # Mark as disconnected on error
-                return {"success": False, "message": str(e)}
-
-    async def blow_horn(self) -> Dict:
+                    await self._submit(
+                        "direction",
+                        lambda: self.train.motor.set_movement_direction(new_dir is Dir.FORWARD)
+                    )
+            except Exception:
+                self._forget_sent("direction", new_dir)
+                self._forget_sent("speed", (new_dir, speed))
+                if self._dir == new_dir:  # Leave it alone if a later command changed it
+                    self._dir = old_dir
+                    self._status["direction"] = self._DIRECTIONS[old_dir]
+                raise
+
+        return self._DIRECTION_OK[new_dir]
+
+    @_train_command
+    async def blow_horn(self, live: bool) -> Mapping:
         """Blow the train horn."""
-        async with self._lock:
+        if not live:
+            logger.info("Mock: Blowing horn")
+        else:
+            # A new blow restarts the release timer rather than being cut short;
+            # cancel first so the old timer can't fire while horn-on is queued
+            self._cancel_horn_off()
+            sound = self.train.sound
+            await self._submit("horn", lambda: sound.set_horn(True))
+            # Release the horn in the background so other commands (emergency
+            # stop in particular) aren't queued behind the half-second blast.
+            self._horn_off_task = asyncio.create_task(self._horn_off_after(0.5))
+        return self._HORN_OK
+
+    @_train_command
+    async def ring_bell(self, live: bool, state: bool, force: bool = False) -> Mapping:
+        """Ring the train bell; a no-op write is skipped unless force is set."""
+        if not live:
+            logger.info("Mock: Bell %s", "on" if state else "off")
+        elif force or self._sent.get("bell") != state:
+            self._sent["bell"] = state
             try:
-                # Track user activity
-                self._last_command_time = time.time()
-
-                # Verify connection before sending command
-                if self._verify_connection():
-                    # Turn horn on briefly then off
-                    await self.train.sound.set_horn(True)
-                    await asyncio.sleep(0.5)
-                    await self.train.sound.set_horn(False)
-                else:
-                    logger.info("Mock: Blowing horn")
-
-                return {"success": True, "message": "Horn blown"}
-            except Exception as e:
-                logger.error(f"Error blowing horn: {e}")
-                self.connected = False  # Mark as disconnected on error
-                return {"success": False, "message": str(e)}
-
-    async def ring_bell(self, state: bool) -> Dict:
-        """Ring the train bell."""
-        async with self._lock:
-            try:
-                # Track user activity
-                self._last_command_time = time.time()
-
-                # Verify connection before sending command
-                if self._verify_connection():
-                    await self.train.sound.set_bell(state)
-                else:
-                    logger.info(f"Mock: Bell {'on' if state else 'off'}")
-
-                return {
-                    "success": True,
-                    "message": f"Bell {'on' if state else 'off'}",
-                    "bell_state": state
-                }
-            except Exception as e:
-                logger.error(f"Error controlling bell: {e}")
-                self.connected = False  # Mark as disconnected on error
-                return {"success": False, "message": str(e)}
-
-    async def set_lights(self, state: bool) -> Dict:
-        """Control the train lights."""
-        async with self._lock:
-            try:
-                # Track user activity
-                self._last_command_time = time.time()
-
-                # Verify connection before sending command
-                if self._verify_connection():
-                    await self.train.lighting.set_lights(state)
-                else:
-                    logger.info(f"Mock: Lights {'on' if state else 'off'}")
-
-                return {
-                    "success": True,
-                    "message": f"Lights {'on' if state else 'off'}",
-                    "lights_state": state
-                }
-            except Exception as e:
-                logger.error(f"Error controlling lights: {e}")
-                self.connected = False  # Mark as disconnected on error
-                return {"success": False, "message": str(e)}
-
-    async def emergency_stop(self) -> Dict:
+                await self._submit("bell", lambda: self.train.sound.set_bell(state))
+            except Exception:
+                self._forget_sent("bell", state)
+                raise
+        return self._BELL_OK[bool(state)]
+
+    @_train_command
+    async def set_lights(self, live: bool, state: bool, force: bool = False) -> Mapping:
+        """Control the train lights; a no-op write is skipped unless force is set."""
+        if not live:
+            logger.info("Mock: Lights %s", "on" if state else "off")
+        else:
+            set_lights = self._set_lights_fn
+            if set_lights is None:
+                return {"success": False, "message": "Lights are not supported by this train"}
+            if force or self._sent.get("lights") != state:
+                self._sent["lights"] = state
+                try:
+                    await self._submit("lights", lambda: set_lights(state))
+                except Exception:
+                    self._forget_sent("lights", state)
+                    raise
+        return self._LIGHTS_OK[bool(state)]
+
+    @_train_command
+    async def emergency_stop(self, live: bool) -> Mapping:
         """Emergency stop the train."""
-        async with self._lock:
-            try:
-                # Track user activity
-                self._last_command_time = time.time()
+        if not live:
+            logger.info("Mock: Emergency stop")
+        else:
+            await self._submit("stop", lambda: self.train.motor.stop())
+            self._sent["speed"] = (None, 0)
 
-                # Verify connection before sending command
-                if self._verify_connection():
-                    await self.train.motor.stop()
-                else:
-                    logger.info("Mock: Emergency stop")
-
-                self._current_speed = 0
-                return {"success": True, "message": "Emergency stop activated"}
-            except Exception as e:
-                logger.error(f"Error during emergency stop: {e}")
-                self.connected = False  # Mark as disconnected on error
-                return {"success": False, "message": str(e)}
+        self._current_speed = 0
+        self._status["speed"] = 0
+        return self._STOP_OK
 
     async def end_session_cleanup(self) -> Dict:
         """
         Clean up at the end of a user session.
         Stops the train and turns off all sounds.
         """
-        async with self._lock:
+        if not (self._health and self.connected):
+            logger.info("Mock: Session cleanup - train stopped, sounds off")
+        else:
             try:
-                # Verify connection before sending commands
-                if self._verify_connection():
-                    # Stop the train
-                    await self.train.motor.stop()
-                    # Turn off bell
-                    await self.train.sound.set_bell(False)
-                    # Ensure horn is off
-                    await self.train.sound.set_horn(False)
-                    logger.info("Session cleanup: train stopped, sounds off")
-                else:
-                    logger.info("Mock: Session cleanup - train stopped, sounds off")
-
-                self._current_speed = 0
-                return {
-                    "success": True,
-                    "message": "Session cleanup completed"
-                }
+                await self._submit("cleanup", self._cleanup_train)
+                self._sent["speed"] = (None, 0)
+                self._sent["bell"] = False
+                logger.info("Session cleanup: train stopped, sounds off")
             except Exception as e:
-                logger.error(f"Error during session cleanup: {e}")
+                logger.error("Error during session cleanup: %s", e)
                 self.connected = False  # Mark as disconnected on error
                 return {"success": False, "message": str(e)}
 
-    def get_status(self) -> Dict:
-        """Get current train status."""
+        self._current_speed = 0
+        self._status["speed"] = 0
         return {
-            "connected": self.connected,
-            "speed": self._current_speed,
-            "direction": self._current_direction,
-            "mock_mode": self.train is None,
-            "train_address": self.train_address,
-            "discovered_trains": len(self._discovered_trains)
+            "success": True,
+            "message": "Session cleanup completed"
         }
 
+    async def apply(self, actions: List[tuple]) -> List[Mapping]:
+        """
+        Run several commands concurrently and return their results in order.
+
+        Each action is a (command, *args) tuple, e.g. [("set_direction", "reverse"),
+        ("set_speed", 40), ("blow_horn",)]. Commands still reach the train in the
+        order given since they share the single BLE writer; only the waiting overlaps.
+        """
+        results = await asyncio.gather(
+            *(self._dispatch(action) for action in actions), return_exceptions=True
+        )
+        return [
+            {"success": False, "message": str(r)} if isinstance(r, Exception) else r
+            for r in results
+        ]
+
+    async def _dispatch(self, action: tuple) -> Mapping:
+        """Run a single (command, *args) action for apply()."""
+        command, *args = action
+        if command not in self._COMMANDS:
+            return {"success": False, "message": f"Unknown command: {command}"}
+
+        # Reject malformed actions here so they come back as errors instead of
+        # failing inside the command (bool is not accepted where int is expected)
+        types = self._COMMANDS[command]
+        if command in self._FORCEABLE and len(args) == len(types) + 1:
+            types += (bool,)
+        if len(args) != len(types) or any(type(a) is not t for a, t in zip(args, types)):
+            return {"success": False, "message": f"Invalid arguments for {command}: {tuple(args)!r}"}
+        return await getattr(self, command)(*args)
+
+    def get_status(self) -> Mapping:
+        """Get current train status (a read-only view; no copy is made)."""
+        return self._status_view
+
     async def scan_for_trains(self, scan_duration: int = 10) -> List[Dict]:
         """
         Scan for nearby LionChief trains using pyLionChief's discovery.
@@ -445,54 +765,59 @@ class TrainController:
         """
         if self._scanning:
             logger.warning("Scan already in progress")
-            return self._discovered_trains
+            return self.get_discovered_trains()
 
         self._scanning = True
-        self._discovered_trains = []
+        self._discovered_trains = {}
+        self._status["discovered_trains"] = 0
 
         try:
-            # Import pyLionChief discovery
-            try:
-                from lionchief.connection import discover_trains
-            except ImportError:
+            if not _HAS_LIONCHIEF:
                 logger.error("pyLionChief not available for train discovery")
                 self._scanning = False
                 return []
 
-            logger.info(f"Starting train discovery scan...")
+            logger.info("Starting train discovery scan...")
 
             # Use pyLionChief's discover_trains function with retry enabled
-            discovered_connections = await discover_trains(retry=True, max_retries=5)
+            discovered_connections = await _DISCOVER_FN(retry=True, max_retries=5)
 
-            # Convert to our format
+            # Convert to our format, keeping one entry per address in case the
+            # scanner reports the same device more than once
             for connection in discovered_connections:
-                # lionchief returns LionChiefConnection objects
+                # lionchief returns LionChiefConnection objects; only their metadata
+                # is kept and a fresh connection is built when one is chosen.
                 # The profile field contains the BLE device with address
+                profile = connection.profile
+                address = str(getattr(profile, 'address', profile))
+                if address in self._discovered_trains:
+                    continue
                 train_info = {
-                    "address": str(connection.profile.address) if hasattr(connection.profile, 'address') else str(connection.profile),
-                    "name": connection.profile.name if hasattr(connection.profile, 'name') else 'LionChief Train',
-                    "type": "LionChief Train",
-                    "connection": connection  # Store the connection object for later use
+                    "address": address,
+                    "name": getattr(profile, 'name', 'LionChief Train'),
+                    "type": "LionChief Train"
                 }
-                self._discovered_trains.append(train_info)
-                logger.info(f"Discovered train: {train_info['name']} ({train_info['address']})")
+                self._discovered_trains[address] = train_info
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Discovered train: %s (%s)", train_info['name'], train_info['address'])
 
             if not self._discovered_trains:
                 logger.warning("No LionChief trains found during scan")
             else:
-                logger.info(f"Found {len(self._discovered_trains)} train(s)")
+                logger.info("Found %d train(s)", len(self._discovered_trains))
 
         except Exception as e:
-            logger.error(f"Error during train scanning: {e}")
+            logger.error("Error during train scanning: %s", e)
             logger.info("Train discovery failed - ensure Bluetooth is enabled and you have permissions")
         finally:
             self._scanning = False
+            self._status["discovered_trains"] = len(self._discovered_trains)
 
-        return self._discovered_trains
+        return self.get_discovered_trains()
 
     def get_discovered_trains(self) -> List[Dict]:
         """Get list of discovered trains."""
-        return self._discovered_trains
+        return list(self._discovered_trains.values())
 
     def is_scanning(self) -> bool:
         """Check if currently scanning for trains."""
@@ -508,34 +833,30 @@ class TrainController:
         Returns:
             Dict with success status and message
         """
-        async with self._lock:
+        async with self._write_lock, self._command_lock:
             try:
                 # Disconnect from current train if connected
                 if self.connected:
-                    await self.disconnect()
+                    await self._disconnect_train()
 
-                # Import pyLionChief
-                try:
-                    from lionchief.connection import LionChiefConnection
-                except ImportError:
+                if not _HAS_LIONCHIEF:
                     return {
                         "success": False,
                         "message": "pyLionChief not available"
                     }
 
-                logger.info(f"Connecting to train at {address}")
+                logger.info("Connecting to train at %s", address)
                 self.train_address = address
-                self.train = LionChiefConnection(address, {})
+                self._status["train_address"] = address
+                self.train = _ENGINE_CLS(address, {})
                 await self.train.connect()
 
-                # Register disconnect callback if possible
-                if hasattr(self.train, 'train') and hasattr(self.train.train, 'set_disconnected_callback'):
-                    self.train.train.set_disconnected_callback(self._on_disconnect_callback)
-                    logger.debug("Disconnect callback registered")
-
-                self.connected = True
+                self._bind_train()
                 logger.info("Train connected successfully")
 
+                # Cut short any pending retry backoff; the loop sees we're connected
+                self._wakeup.set()
+
                 return {
                     "success": True,
                     "message": f"Connected to train at {address}",
@@ -543,9 +864,10 @@ class TrainController:
                 }
 
             except Exception as e:
-                logger.error(f"Error connecting to train: {e}")
+                logger.error("Error connecting to train: %s", e)
                 self.train = None
                 self.connected = False
+                self._health = False
                 return {
                     "success": False,
                     "message": f"Failed to connect: {str(e)}"
@@ -553,11 +875,15 @@ class TrainController:
 
     async def disconnect(self):
         """Disconnect from the train."""
-        async with self._lock:
-            try:
-                if self.train and self.connected:
-                    await self.train.disconnect()
-                    self.connected = False
-                    logger.info("Train disconnected")
-            except Exception as e:
-                logger.error(f"Error disconnecting from train: {e}")
+        async with self._write_lock, self._command_lock:
+            await self._disconnect_train()
+
+    async def _disconnect_train(self):
+        """Disconnect the current train; callers hold _write_lock and _command_lock."""
+        try:
+            if self.train and self.connected:
+                await self.train.disconnect()
+                self.connected = False
+                logger.info("Train disconnected")
+        except Exception as e:
+            logger.error("Error disconnecting from train: %s", e)
@@ -1,26 +1,165 @@
 """Train scripting language interpreter for automated sequences."""
 import asyncio
+import functools
 import logging
-import re
-from typing import List, Dict, Any, Optional
+import math
+from typing import List, Dict, Any, NamedTuple, Sequence, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScriptCommand:
-    """Represents a parsed script command."""
+    """Represents a parsed script command (shared by cached compiles, so immutable)."""
     command: str
-    args: List[str]
+    args: Tuple[str, ...]
     line_number: int
 
 
+# Shared args value for commands without arguments
+_EMPTY_ARGS: Tuple[str, ...] = ()
+
+
 class TrainScriptError(Exception):
     """Exception raised for script execution errors."""
     pass
 
 
+# Opcodes for compiled scripts; the first eight index the interpreter's handler table
+OP_SPEED = 0
+OP_FORWARD = 1
+OP_REVERSE = 2
+OP_TOGGLE = 3
+OP_HORN = 4
+OP_BELL = 5
+OP_LIGHTS = 6
+OP_WAIT = 7
+OP_REPEAT = 8
+OP_END = 9
+
+_OPCODES = {
+    'speed': OP_SPEED,
+    'forward': OP_FORWARD,
+    'reverse': OP_REVERSE,
+    'toggle': OP_TOGGLE,
+    'horn': OP_HORN,
+    'bell': OP_BELL,
+    'lights': OP_LIGHTS,
+    'wait': OP_WAIT,
+    'repeat': OP_REPEAT,
+    'end': OP_END,
+}
+
+
+def _payload(op: int, args: Sequence[str]) -> Any:
+    """Convert a validated command's arguments to the value its handler takes."""
+    if op == OP_SPEED or op == OP_REPEAT:
+        return int(args[0])
+    if op == OP_BELL or op == OP_LIGHTS:
+        return args[0].lower() == 'on'
+    if op == OP_WAIT:
+        return float(args[0])
+    return None
+
+
+# Expected argument count for each command
+VALID_COMMANDS = {
+    'speed': 1,      # speed <-100 to 100>
+    'forward': 0,    # forward
+    'reverse': 0,    # reverse
+    'toggle': 0,     # toggle
+    'horn': 0,       # horn
+    'bell': 1,       # bell on|off
+    'lights': 1,     # lights on|off
+    'wait': 1,       # wait <seconds>
+    'repeat': 2,     # repeat <n> times
+    'end': 0,        # end
+}
+
+
+def _unsigned_digits(s: str) -> bool:
+    """Whether s is ASCII digits after an optional leading sign."""
+    digits = s[1:] if s[:1] in ('-', '+') else s
+    return digits.isascii() and digits.isdigit()
+
+
+def _parse_number(s: str, allow_fraction: bool = False):
+    """
+    Return s as an int, or None if it isn't a plain decimal integer. With
+    allow_fraction, return a finite float and also accept a decimal point and
+    an exponent ('1.5', '1e-3'); 'nan' and 'inf' are still refused.
+    """
+    if not allow_fraction:
+        return int(s) if _unsigned_digits(s) else None
+
+    mantissa, e, exponent = s.lower().partition('e')
+    if e and not _unsigned_digits(exponent):
+        return None
+    if not _unsigned_digits(mantissa.replace('.', '', 1)):
+        return None
+    value = float(s)
+    return value if math.isfinite(value) else None  # '1e999' overflows to inf
+
+
+def _validate_speed(command: str, args: Sequence[str], line_num: int):
+    speed = _parse_number(args[0])
+    if speed is None or not -100 <= speed <= 100:
+        raise TrainScriptError(
+            f"Line {line_num}: Speed must be integer -100 to 100, got '{args[0]}'"
+        )
+
+
+def _validate_on_off(command: str, args: Sequence[str], line_num: int):
+    if args[0].lower() not in ('on', 'off'):
+        raise TrainScriptError(
+            f"Line {line_num}: {command.capitalize()} argument must be 'on' or 'off', got '{args[0]}'"
+        )
+
+
+def _validate_wait(command: str, args: Sequence[str], line_num: int):
+    wait_time = _parse_number(args[0], allow_fraction=True)
+    if wait_time is None or wait_time < 0:
+        raise TrainScriptError(
+            f"Line {line_num}: Wait time must be positive number, got '{args[0]}'"
+        )
+
+
+def _validate_repeat(command: str, args: Sequence[str], line_num: int):
+    times = _parse_number(args[0])
+    if times is None or times < 1:
+        raise TrainScriptError(
+            f"Line {line_num}: Repeat count must be positive integer, got '{args[0]}'"
+        )
+
+    if args[1].lower() != 'times':
+        raise TrainScriptError(
+            f"Line {line_num}: Expected 'times' keyword, got '{args[1]}'"
+        )
+
+
+# Argument value checks for commands that take arguments
+VALIDATORS = {
+    'speed': _validate_speed,
+    'bell': _validate_on_off,
+    'lights': _validate_on_off,
+    'wait': _validate_wait,
+    'repeat': _validate_repeat,
+}
+
+
+class CompiledScript(NamedTuple):
+    """
+    A parsed and validated script, cached by its source text.
+
+    Loops are flattened: a 'repeat' pushes its count and the matching 'end'
+    carries the repeat's index to jump back to, so execution is a single loop.
+    """
+    commands: Tuple[ScriptCommand, ...]
+    ops: bytes                  # Opcode per command
+    payloads: Tuple[Any, ...]   # Handler argument (or jump target for 'end') per command
+
+
 class TrainScriptInterpreter:
     """
     Interpreter for train control scripts.
@@ -66,6 +205,18 @@ class TrainScriptInterpreter:
         self.train_controller = train_controller
         self.is_running = False
         self.should_stop = False
+        self._stop_event = asyncio.Event()  # Set by stop() to cut a 'wait' short
+        # Indexed by opcode (OP_SPEED .. OP_WAIT)
+        self._handlers = (
+            self._do_speed,
+            self._do_forward,
+            self._do_reverse,
+            self._do_toggle,
+            self._do_horn,
+            self._do_bell,
+            self._do_lights,
+            self._do_wait,
+        )
 
     def parse_script(self, script: str) -> List[ScriptCommand]:
         """
@@ -80,6 +231,15 @@ class TrainScriptInterpreter:
         Raises:
             TrainScriptError: If script has syntax errors
         """
+        return list(self._compile(script).commands)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _compile(script: str) -> CompiledScript:
+        """
+        Parse and validate a script once; repeat runs of the same text (saved
+        jobs) reuse the result. Scripts with errors raise and are not cached.
+        """
         commands = []
         lines = script.strip().split('\n')
 
@@ -88,19 +248,19 @@ class TrainScriptInterpreter:
             line = line.strip()
 
             # Skip empty lines and comments
-            if not line or line.startswith('#'):
-                continue
-
-            # Parse command and arguments
-            parts = line.split()
-            if not parts:
+            if not line or line[0] == '#':
                 continue
 
-            command = parts[0].lower()
-            args = parts[1:]
+            # Parse command and arguments; only split the remainder when there is one
+            head, _, rest = line.partition(' ')
+            if '\t' in head:  # Tab after the command name
+                head, _, rest = line.replace('\t', ' ').partition(' ')
+            command = head if head.islower() else head.lower()
+            rest = rest.strip()
+            args = tuple(rest.split()) if rest else _EMPTY_ARGS
 
             # Validate command syntax
-            self._validate_command(command, args, line_num)
+            TrainScriptInterpreter._validate_command(command, args, line_num)
 
             commands.append(ScriptCommand(
                 command=command,
@@ -109,102 +269,61 @@ class TrainScriptInterpreter:
             ))
 
         # Validate loop structure
-        self._validate_loops(commands)
+        repeat_of = TrainScriptInterpreter._validate_loops(commands)
 
-        return commands
+        ops = bytes(_OPCODES[cmd.command] for cmd in commands)
+        payloads = tuple(
+            repeat_of[i] if op == OP_END else _payload(op, cmd.args)
+            for i, (op, cmd) in enumerate(zip(ops, commands))
+        )
+        return CompiledScript(tuple(commands), ops, payloads)
 
-    def _validate_command(self, command: str, args: List[str], line_num: int):
+    @staticmethod
+    def _validate_command(command: str, args: Sequence[str], line_num: int):
         """Validate command syntax."""
-        valid_commands = {
-            'speed': 1,      # speed <-100 to 100>
-            'forward': 0,    # forward
-            'reverse': 0,    # reverse
-            'toggle': 0,     # toggle
-            'horn': 0,       # horn
-            'bell': 1,       # bell on|off
-            'lights': 1,     # lights on|off
-            'wait': 1,       # wait <seconds>
-            'repeat': 2,     # repeat <n> times
-            'end': 0,        # end
-        }
-
-        if command not in valid_commands:
+        expected_args = VALID_COMMANDS.get(command)
+        if expected_args is None:
             raise TrainScriptError(
                 f"Line {line_num}: Unknown command '{command}'"
             )
 
-        expected_args = valid_commands[command]
         if len(args) != expected_args:
             raise TrainScriptError(
                 f"Line {line_num}: Command '{command}' expects {expected_args} argument(s), got {len(args)}"
             )
 
         # Validate specific argument values
-        if command == 'speed':
-            try:
-                speed = int(args[0])
-                if not -100 <= speed <= 100:
-                    raise ValueError()
-            except ValueError:
-                raise TrainScriptError(
-                    f"Line {line_num}: Speed must be integer -100 to 100, got '{args[0]}'"
-                )
+        validator = VALIDATORS.get(command)
+        if validator is not None:
+            validator(command, args, line_num)
 
-        elif command == 'bell':
-            if args[0].lower() not in ['on', 'off']:
-                raise TrainScriptError(
-                    f"Line {line_num}: Bell argument must be 'on' or 'off', got '{args[0]}'"
-                )
-
-        elif command == 'lights':
-            if args[0].lower() not in ['on', 'off']:
-                raise TrainScriptError(
-                    f"Line {line_num}: Lights argument must be 'on' or 'off', got '{args[0]}'"
-                )
-
-        elif command == 'wait':
-            try:
-                wait_time = float(args[0])
-                if wait_time < 0:
-                    raise ValueError()
-            except ValueError:
-                raise TrainScriptError(
-                    f"Line {line_num}: Wait time must be positive number, got '{args[0]}'"
-                )
-
-        elif command == 'repeat':
-            try:
-                times = int(args[0])
-                if times < 1:
-                    raise ValueError()
-            except ValueError:
-                raise TrainScriptError(
-                    f"Line {line_num}: Repeat count must be positive integer, got '{args[0]}'"
-                )
-
-            if args[1].lower() != 'times':
-                raise TrainScriptError(
-                    f"Line {line_num}: Expected 'times' keyword, got '{args[1]}'"
-                )
+    @staticmethod
+    def _validate_loops(commands: List[ScriptCommand]) -> Dict[int, int]:
+        """
+        Validate loop structure (matching repeat/end).
 
-    def _validate_loops(self, commands: List[ScriptCommand]):
-        """Validate loop structure (matching repeat/end)."""
+        Returns:
+            Map of each 'end' command index to its matching 'repeat' index
+        """
         stack = []
-        for cmd in commands:
+        repeat_of = {}
+        for i, cmd in enumerate(commands):
             if cmd.command == 'repeat':
-                stack.append(cmd.line_number)
+                stack.append(i)
             elif cmd.command == 'end':
                 if not stack:
                     raise TrainScriptError(
                         f"Line {cmd.line_number}: 'end' without matching 'repeat'"
                     )
-                stack.pop()
+                repeat_of[i] = stack.pop()
 
         if stack:
             raise TrainScriptError(
-                f"Line {stack[-1]}: 'repeat' without matching 'end'"
+                f"Line {commands[stack[-1]].line_number}: 'repeat' without matching 'end'"
             )
 
+        return repeat_of
+
     async def execute_script(self, script: str) -> Dict[str, Any]:
         """
         Execute a train control script.
@@ -224,17 +343,18 @@ class TrainScriptInterpreter:
         try:
             self.is_running = True
             self.should_stop = False
+            self._stop_event.clear()
 
-            # Parse script
-            commands = self.parse_script(script)
+            # Parse script (cached for previously seen script text)
+            compiled = self._compile(script)
 
             # Execute commands
-            await self._execute_commands(commands)
+            await self._execute_commands(compiled)
 
             return {
                 "success": True,
                 "message": "Script completed successfully",
-                "commands_executed": len(commands)
+                "commands_executed": len(compiled.commands)
             }
 
         except TrainScriptError as e:
@@ -252,115 +372,84 @@ class TrainScriptInterpreter:
         finally:
             self.is_running = False
 
-    async def _execute_commands(self, commands: List[ScriptCommand], start_idx: int = 0, end_idx: Optional[int] = None):
-        """Execute a sequence of commands."""
-        if end_idx is None:
-            end_idx = len(commands)
+    async def _execute_commands(self, compiled: CompiledScript):
+        """Execute a compiled script as one flat loop, using a stack of remaining repeat counts."""
+        ops = compiled.ops
+        payloads = compiled.payloads
+        handlers = self._handlers
+        remaining = []
+        debug = logger.isEnabledFor(logging.DEBUG)  # Checked once; skips per-step formatting
 
-        i = start_idx
-        while i < end_idx:
+        i = 0
+        while i < len(ops):
             if self.should_stop:
                 logger.info("Script execution stopped")
                 break
 
-            cmd = commands[i]
+            op = ops[i]
+            payload = payloads[i]
 
             try:
-                if cmd.command == 'repeat':
-                    # Find matching end
-                    loop_end = self._find_loop_end(commands, i)
-                    times = int(cmd.args[0])
+                if op == OP_REPEAT:
+                    remaining.append(payload)  # Validated >= 1, so the body always runs
 
-                    # Execute loop body
-                    for _ in range(times):
-                        if self.should_stop:
-                            break
-                        await self._execute_commands(commands, i + 1, loop_end)
-
-                    i = loop_end  # Skip to end
-
-                elif cmd.command == 'end':
-                    # Should be handled by repeat logic
-                    pass
+                elif op == OP_END:
+                    remaining[-1] -= 1
+                    if remaining[-1]:
+                        i = payload  # Back to the 'repeat'; resumes at the body below
+                    else:
+                        remaining.pop()
 
                 else:
-                    # Execute single command
-                    await self._execute_single_command(cmd)
+                    if debug:
+                        cmd = compiled.commands[i]
+                        logger.debug("Executing: %s %s", cmd.command, ' '.join(cmd.args))
+                    await handlers[op](payload)
 
             except Exception as e:
+                cmd = compiled.commands[i]
                 raise TrainScriptError(
                     f"Line {cmd.line_number}: Error executing '{cmd.command}': {str(e)}"
                 )
 
             i += 1
 
-    def _find_loop_end(self, commands: List[ScriptCommand], repeat_idx: int) -> int:
-        """Find the matching 'end' for a 'repeat' command."""
-        depth = 0
-        for i in range(repeat_idx, len(commands)):
-            if commands[i].command == 'repeat':
-                depth += 1
-            elif commands[i].command == 'end':
-                depth -= 1
-                if depth == 0:
-                    return i
-        return len(commands)
-
-    async def _execute_single_command(self, cmd: ScriptCommand):
-        """Execute a single train command."""
-        command = cmd.command
-        args = cmd.args
-
-        logger.debug(f"Executing: {command} {' '.join(args)}")
-
-        if command == 'speed':
-            speed = int(args[0])
-            result = await self.train_controller.set_speed(speed)
-            if not result.get("success", False):
-                raise Exception(result.get("message", "Speed command failed"))
-
-        elif command == 'forward':
-            result = await self.train_controller.set_direction('forward')
-            if not result.get("success", False):
-                raise Exception(result.get("message", "Direction command failed"))
-
-        elif command == 'reverse':
-            result = await self.train_controller.set_direction('reverse')
-            if not result.get("success", False):
-                raise Exception(result.get("message", "Direction command failed"))
-
-        elif command == 'toggle':
-            result = await self.train_controller.set_direction('toggle')
-            if not result.get("success", False):
-                raise Exception(result.get("message", "Direction command failed"))
-
-        elif command == 'horn':
-            result = await self.train_controller.blow_horn()
-            if not result.get("success", False):
-                raise Exception(result.get("message", "Horn command failed"))
-
-        elif command == 'bell':
-            state = args[0].lower() == 'on'
-            result = await self.train_controller.ring_bell(state)
-            if not result.get("success", False):
-                raise Exception(result.get("message", "Bell command failed"))
-
-        elif command == 'lights':
-            state = args[0].lower() == 'on'
-            result = await self.train_controller.set_lights(state)
-            if not result.get("success", False):
-                raise Exception(result.get("message", "Lights command failed"))
-
-        elif command == 'wait':
-            wait_time = float(args[0])
-            # Check for stop signal periodically during wait
-            elapsed = 0
-            interval = 0.1
-            while elapsed < wait_time and not self.should_stop:
-                await asyncio.sleep(min(interval, wait_time - elapsed))
-                elapsed += interval
+    @staticmethod
+    def _check(result: Dict, failure: str):
+        """Raise if a train controller command reported failure."""
+        if not result.get("success", False):
+            raise Exception(result.get("message", failure))
+
+    async def _do_speed(self, speed: int):
+        self._check(await self.train_controller.set_speed(speed), "Speed command failed")
+
+    async def _do_forward(self, _):
+        self._check(await self.train_controller.set_direction('forward'), "Direction command failed")
+
+    async def _do_reverse(self, _):
+        self._check(await self.train_controller.set_direction('reverse'), "Direction command failed")
+
+    async def _do_toggle(self, _):
+        self._check(await self.train_controller.set_direction('toggle'), "Direction command failed")
+
+    async def _do_horn(self, _):
+        self._check(await self.train_controller.blow_horn(), "Horn command failed")
+
+    async def _do_bell(self, state: bool):
+        self._check(await self.train_controller.ring_bell(state), "Bell command failed")
+
+    async def _do_lights(self, state: bool):
+        self._check(await self.train_controller.set_lights(state), "Lights command failed")
+
+    async def _do_wait(self, wait_time: float):
+        # Sleep once, returning early if stop() is called
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=wait_time)
+        except asyncio.TimeoutError:
+            pass
 
     def stop(self):
         """Stop script execution."""
         self.should_stop = True
+        self._stop_event.set()
         logger.info("Script stop requested")
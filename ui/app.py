@@ -1,14 +1,24 @@
 """Simple Flask app to serve the UI."""
-from flask import Flask, render_template, send_from_directory, request, jsonify, session, Response, stream_with_context
 import os
+
+# Served by gunicorn's gevent worker in production; patch the stdlib before
+# requests/websocket-client import socket so blocking I/O yields to other clients.
+if os.getenv("UI_GEVENT") == "1":
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, render_template, send_from_directory, request, jsonify, session, Response, stream_with_context
 import json
+import hashlib
+import functools
 import requests
+from requests.adapters import HTTPAdapter
 import threading
 import time
 import queue
 import websocket
 
-from themes import get_theme, get_all_themes, DEFAULT_THEME
+from themes import THEMES, get_theme, get_all_themes, DEFAULT_THEME
 
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY", "lionchief-train-secret-key-change-in-production")
@@ -22,10 +32,20 @@ THEME_FILE = "current_theme.json"
 # API routes are at /api/* and work with absolute URLs in JavaScript.
 # Traefik stripPrefix middleware handles the /prod/train/v1 prefix before reaching Flask.
 
+# Shared HTTP session so proxy calls reuse pooled keep-alive connections to the API
+api_session = requests.Session()
+api_session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0))
+api_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0))
+
 # WebSocket to SSE bridge
-sse_clients = []
+sse_clients = set()  # one bounded queue.Queue per connected SSE client
+sse_clients_lock = threading.Lock()
+sse_clients_snapshot = ()  # Immutable copy of sse_clients, rebuilt under the lock on every change
 ws_thread = None
 ws_connected = False
+SSE_QUEUE_SIZE = 256  # Events buffered per client before it is dropped as too slow
+BROADCAST_BATCH_SIZE = 50  # Clients served per broadcast slice before yielding
+SSE_COALESCE_DELAY = 0.005  # Upstream messages arriving within this window share one broadcast
 
 
 @app.context_processor
@@ -34,16 +54,34 @@ def inject_base_path():
     return {'base_path': BASE_PATH}
 
 
+# Last theme read from THEME_FILE, reused until the file's mtime changes
+_theme_cache = {"mtime": -1, "value": DEFAULT_THEME}
+
+
 def load_current_theme():
-    """Load the current theme from file."""
+    """Load the current theme from file (re-read only when the file changes)."""
     try:
-        if os.path.exists(THEME_FILE):
-            with open(THEME_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get("theme", DEFAULT_THEME)
+        mtime = os.stat(THEME_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return DEFAULT_THEME
     except Exception as e:
         print(f"Error loading theme: {e}")
-    return DEFAULT_THEME
+        return DEFAULT_THEME
+
+    if mtime == _theme_cache["mtime"]:
+        return _theme_cache["value"]
+
+    try:
+        with open(THEME_FILE, 'r') as f:
+            data = json.load(f)
+        theme_id = data.get("theme", DEFAULT_THEME)
+    except Exception as e:
+        print(f"Error loading theme: {e}")
+        return DEFAULT_THEME
+
+    _theme_cache["mtime"] = mtime
+    _theme_cache["value"] = theme_id
+    return theme_id
 
 
 def save_current_theme(theme_id):
@@ -51,6 +89,7 @@ def save_current_theme(theme_id):
     try:
         with open(THEME_FILE, 'w') as f:
             json.dump({"theme": theme_id}, f)
+        _theme_cache["mtime"] = -1  # Force a re-read, even if the mtime didn't tick
         return True
     except Exception as e:
         print(f"Error saving theme: {e}")
@@ -88,15 +127,31 @@ def admin_theme():
                          api_url=API_URL)
 
 
+@functools.lru_cache(maxsize=len(THEMES))
+def _theme_body(theme_id):
+    """Serialized /api/theme body and its ETag, built once per theme and reused."""
+    body = json.dumps(
+        {"theme_id": theme_id, "theme": get_theme(theme_id)},
+        sort_keys=True, separators=(",", ":")
+    ).encode()
+    return body, hashlib.md5(body, usedforsecurity=False).hexdigest()
+
+
 @app.route("/api/theme", methods=["GET"])
 def get_current_theme():
-    """Get the current theme."""
-    current_theme_id = load_current_theme()
-    theme_data = get_theme(current_theme_id)
-    return jsonify({
-        "theme_id": current_theme_id,
-        "theme": theme_data
-    })
+    """Get the current theme (304 if the client already has it)."""
+    theme_id = load_current_theme()
+    if theme_id not in THEMES:
+        # POST /api/theme accepts any id; serve (and cache) unknown ones as the default
+        theme_id = DEFAULT_THEME
+    body, etag = _theme_body(theme_id)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @app.route("/api/theme", methods=["POST"])
@@ -128,314 +183,132 @@ def set_theme():
 # API PROXY ENDPOINTS
 # ============================================================================
 
-@app.route("/api/queue/join", methods=["POST"])
-def proxy_queue_join():
-    """Proxy queue join request to API."""
-    try:
-        response = requests.post(
-            f"{API_URL}/queue/join",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/queue/leave", methods=["POST"])
-def proxy_queue_leave():
-    """Proxy queue leave request to API."""
-    try:
-        response = requests.post(
-            f"{API_URL}/queue/leave",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/queue/status", methods=["GET"])
-def proxy_queue_status():
-    """Proxy queue status request to API."""
-    try:
-        response = requests.get(f"{API_URL}/queue/status", timeout=10)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/train/speed", methods=["POST"])
-def proxy_train_speed():
-    """Proxy train speed request to API."""
-    try:
-        response = requests.post(
-            f"{API_URL}/train/speed",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/train/direction", methods=["POST"])
-def proxy_train_direction():
-    """Proxy train direction request to API."""
-    try:
-        response = requests.post(
-            f"{API_URL}/train/direction",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/train/horn", methods=["POST"])
-def proxy_train_horn():
-    """Proxy train horn request to API."""
-    try:
-        response = requests.post(
-            f"{API_URL}/train/horn",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/train/bell", methods=["POST"])
-def proxy_train_bell():
-    """Proxy train bell request to API."""
-    try:
-        response = requests.post(
-            f"{API_URL}/train/bell",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/train/emergency-stop", methods=["POST"])
-def proxy_train_emergency_stop():
-    """Proxy train emergency stop request to API."""
-    try:
-        response = requests.post(
-            f"{API_URL}/train/emergency-stop",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/train/status", methods=["GET"])
-def proxy_train_status():
-    """Proxy train status request to API."""
-    try:
-        response = requests.get(f"{API_URL}/train/status", timeout=10)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/config", methods=["GET"])
-def proxy_config_get():
-    """Proxy config get request to API."""
-    try:
-        response = requests.get(f"{API_URL}/config", timeout=10)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/config", methods=["POST"])
-def proxy_config_post():
-    """Proxy config update request to API."""
-    try:
-        response = requests.post(
-            f"{API_URL}/config",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-# Admin panel proxy endpoints
-@app.route("/api/controls", methods=["GET"])
-def proxy_controls_get():
-    """Proxy controls config get request to API."""
-    try:
-        response = requests.get(f"{API_URL}/controls", timeout=10)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/controls", methods=["POST"])
-def proxy_controls_post():
-    """Proxy controls config update request to API."""
-    try:
-        response = requests.post(
-            f"{API_URL}/controls",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/analytics/stats", methods=["GET"])
-def proxy_analytics_stats():
-    """Proxy analytics stats request to API."""
-    try:
-        response = requests.get(f"{API_URL}/analytics/stats", timeout=10)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/analytics/controls", methods=["GET"])
-def proxy_analytics_controls():
-    """Proxy analytics controls request to API."""
-    try:
-        response = requests.get(f"{API_URL}/analytics/controls", timeout=10)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/analytics/cleanup", methods=["DELETE"])
-def proxy_analytics_cleanup():
-    """Proxy analytics cleanup request to API."""
-    try:
-        days = request.args.get('days', 30)
-        response = requests.delete(f"{API_URL}/analytics/cleanup?days={days}", timeout=10)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
-
-
-@app.route("/api/profanity-filter", methods=["GET"])
-def proxy_profanity_filter_get():
-    """Proxy profanity filter get request to API."""
-    try:
-        response = requests.get(f"{API_URL}/profanity-filter", timeout=10)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
+# UI routes forwarded to the API under the same path minus the /api prefix.
+# Only these are exposed; everything else on the API stays unreachable via the UI.
+# An optional third item gives query parameters to send when the client omits them.
+PROXY_ROUTES = [
+    ("/api/queue/join", ["POST"]),
+    ("/api/queue/leave", ["POST"]),
+    ("/api/queue/status", ["GET"]),
+    ("/api/train/speed", ["POST"]),
+    ("/api/train/direction", ["POST"]),
+    ("/api/train/horn", ["POST"]),
+    ("/api/train/bell", ["POST"]),
+    ("/api/train/emergency-stop", ["POST"]),
+    ("/api/train/status", ["GET"]),
+    ("/api/config", ["GET", "POST"]),
+    ("/api/controls", ["GET", "POST"]),
+    ("/api/analytics/stats", ["GET"]),
+    ("/api/analytics/controls", ["GET"]),
+    ("/api/analytics/cleanup", ["DELETE"], {"days": "30"}),
+    ("/api/profanity-filter", ["GET"]),
+    ("/api/profanity-filter/add", ["POST"], {"word": "", "admin_password": ""}),
+    ("/api/profanity-filter/remove", ["DELETE"], {"word": "", "admin_password": ""}),
+    ("/api/profanity-filter/reset", ["POST"], {"admin_password": ""}),
+    ("/api/jobs", ["GET", "POST"]),
+    ("/api/jobs/<job_id>", ["DELETE"]),
+    ("/api/jobs/<job_id>/run", ["POST"]),
+]
+PROXY_QUERY_DEFAULTS = {route[0]: route[2] for route in PROXY_ROUTES if len(route) > 2}
+
+
+# Polled GETs whose responses are shared between clients for a short window,
+# so N open tabs polling once a second cost the API one request, not N.
+CACHED_GETS = {"/api/train/status", "/api/queue/status"}
+PROXY_CACHE_TTL = 0.25
+
+# Keyed by path only (neither endpoint takes a query string), so both dicts
+# hold at most one entry per CACHED_GETS path
+_proxy_cache = {}  # path -> (expires, content, status, content_type)
+_proxy_fetch_locks = {path: threading.Lock() for path in CACHED_GETS}
+
+
+def _forward_to_api():
+    """Send the current request to the API and return (content, status, content_type)."""
+    headers = {}
+    if request.content_type:
+        headers["Content-Type"] = request.content_type
+    params = request.args
+    defaults = PROXY_QUERY_DEFAULTS.get(request.path)
+    if defaults:
+        params = {**defaults, **params.to_dict()}
+    response = api_session.request(
+        request.method,
+        f"{API_URL}{request.path[len('/api'):]}",
+        params=params,
+        data=request.get_data(),
+        headers=headers,
+        timeout=10
+    )
+    return (
+        response.content,
+        response.status_code,
+        response.headers.get("Content-Type", "application/json")
+    )
 
 
-@app.route("/api/profanity-filter/add", methods=["POST"])
-def proxy_profanity_filter_add():
-    """Proxy profanity filter add request to API."""
-    try:
-        word = request.args.get('word', '')
-        admin_password = request.args.get('admin_password', '')
-        response = requests.post(
-            f"{API_URL}/profanity-filter/add?word={word}&admin_password={admin_password}",
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
+def _cached_forward(path):
+    """Serve a polled GET from the short-lived cache, fetching at most once per path."""
+    entry = _proxy_cache.get(path)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1:]
 
+    with _proxy_fetch_locks[path]:
+        # Another request may have refreshed the entry while we waited
+        entry = _proxy_cache.get(path)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1:]
+        result = _forward_to_api()
+        if result[1] == 200:
+            _proxy_cache[path] = (time.monotonic() + PROXY_CACHE_TTL, *result)
+        return result
 
-@app.route("/api/profanity-filter/remove", methods=["DELETE"])
-def proxy_profanity_filter_remove():
-    """Proxy profanity filter remove request to API."""
-    try:
-        word = request.args.get('word', '')
-        admin_password = request.args.get('admin_password', '')
-        response = requests.delete(
-            f"{API_URL}/profanity-filter/remove?word={word}&admin_password={admin_password}",
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
 
+def proxy_to_api(**_):
+    """
+    Forward the request to the API and pass the response body straight back.
 
-@app.route("/api/profanity-filter/reset", methods=["POST"])
-def proxy_profanity_filter_reset():
-    """Proxy profanity filter reset request to API."""
+    The body, query string and content type are relayed as raw bytes, so JSON
+    is never decoded and re-encoded on the way through. Any write drops the
+    cached polling responses so the next poll sees its effect.
+    """
     try:
-        admin_password = request.args.get('admin_password', '')
-        response = requests.post(
-            f"{API_URL}/profanity-filter/reset?admin_password={admin_password}",
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
+        if request.method == "GET" and request.path in CACHED_GETS:
+            content, status, content_type = _cached_forward(request.path)
+        else:
+            content, status, content_type = _forward_to_api()
+            if request.method != "GET":
+                _proxy_cache.clear()
+        return Response(content, status=status, content_type=content_type)
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
 
-@app.route("/api/jobs", methods=["GET"])
-def proxy_jobs_get():
-    """Proxy jobs get request to API."""
-    try:
-        response = requests.get(f"{API_URL}/jobs", timeout=10)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
+for _rule, _methods, *_ in PROXY_ROUTES:
+    app.add_url_rule(_rule, endpoint=f"proxy {_rule}", view_func=proxy_to_api, methods=_methods)
 
 
-@app.route("/api/jobs", methods=["POST"])
-def proxy_jobs_post():
-    """Proxy jobs create request to API."""
-    try:
-        admin_password = request.args.get('admin_password', '')
-        response = requests.post(
-            f"{API_URL}/jobs?admin_password={admin_password}",
-            json=request.json,
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
+# ============================================================================
+# SERVER-SENT EVENTS (SSE) FOR REAL-TIME UPDATES
+# ============================================================================
 
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
 
-@app.route("/api/jobs/<job_id>", methods=["DELETE"])
-def proxy_jobs_delete(job_id):
-    """Proxy jobs delete request to API."""
-    try:
-        admin_password = request.args.get('admin_password', '')
-        response = requests.delete(
-            f"{API_URL}/jobs/{job_id}?admin_password={admin_password}",
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
 
+def _sse_event(message):
+    """Frame a message (str or UTF-8 bytes) as an SSE event shared by every client stream."""
+    if isinstance(message, str):
+        message = message.encode()
+    return b"".join((_SSE_PREFIX, message, _SSE_SUFFIX))  # One allocation, unlike chained +
 
-@app.route("/api/jobs/<job_id>/run", methods=["POST"])
-def proxy_jobs_run(job_id):
-    """Proxy jobs run request to API."""
-    try:
-        admin_password = request.args.get('admin_password', '')
-        response = requests.post(
-            f"{API_URL}/jobs/{job_id}/run?admin_password={admin_password}",
-            timeout=10
-        )
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
 
+# Connection-status events by ws_connected value, encoded once
+_STATUS_EVENTS = {
+    connected: _sse_event(json.dumps({"type": "connection_status", "connected": connected}))
+    for connected in (False, True)
+}
 
-# ============================================================================
-# SERVER-SENT EVENTS (SSE) FOR REAL-TIME UPDATES
-# ============================================================================
 
 def websocket_to_sse_bridge():
     """Background thread that connects to API WebSocket and broadcasts to SSE clients."""
@@ -453,7 +326,9 @@ def websocket_to_sse_bridge():
                 on_close=lambda ws, close_status_code, close_msg: on_ws_close(),
                 on_error=lambda ws, error: on_ws_error(error)
             )
-            ws.run_forever()
+            # Without wsaccel, websocket-client validates UTF-8 byte by byte in Python.
+            # Skipping it also skips the decode, so messages arrive as the API's raw bytes.
+            ws.run_forever(skip_utf8_validation=True)
         except Exception as e:
             print(f"WebSocket error: {e}")
             ws_connected = False
@@ -465,8 +340,8 @@ def on_ws_open():
     global ws_connected
     ws_connected = True
     print("WebSocket connected to API")
-    # Send connection status to all SSE clients
-    broadcast_to_sse_clients(json.dumps({"type": "connection_status", "connected": True}))
+    # Send connection status to all SSE clients, in order with queued messages
+    _queue_event(_STATUS_EVENTS[True])
 
 
 def on_ws_close():
@@ -474,8 +349,8 @@ def on_ws_close():
     global ws_connected
     ws_connected = False
     print("WebSocket disconnected from API")
-    # Send disconnection status to all SSE clients
-    broadcast_to_sse_clients(json.dumps({"type": "connection_status", "connected": False}))
+    # Send disconnection status to all SSE clients, in order with queued messages
+    _queue_event(_STATUS_EVENTS[False])
 
 
 def on_ws_error(error):
@@ -483,16 +358,77 @@ def on_ws_error(error):
     print(f"WebSocket error: {error}")
 
 
+# Framed events waiting for the flusher's next broadcast
+_pending_events = []
+_pending_events_lock = threading.Lock()
+_pending_events_ready = threading.Event()
+flusher_thread = None
+
+
 def broadcast_to_sse_clients(message):
-    """Broadcast a message to all connected SSE clients."""
-    # Store message in queue for each client
-    for client_queue in list(sse_clients):
+    """
+    Broadcast a message to all connected SSE clients.
+
+    Messages in a burst are collected for SSE_COALESCE_DELAY and fanned out
+    as one queue item. Each stays its own SSE event, so clients see no change.
+    """
+    _queue_event(_sse_event(message))
+
+
+def _queue_event(event):
+    """Hand an already-framed SSE event to the flusher."""
+    with _pending_events_lock:
+        _pending_events.append(event)
+        _pending_events_ready.set()
+
+
+def sse_flusher():
+    """
+    Background thread that is the only caller of _broadcast_event.
+
+    One broadcaster keeps every client's events in the order they were queued,
+    and means only it ever puts to client queues (which eviction relies on).
+    """
+    while True:
+        _pending_events_ready.wait()
+        time.sleep(SSE_COALESCE_DELAY)  # Let the rest of a burst arrive
+        with _pending_events_lock:
+            events = b"".join(_pending_events)
+            _pending_events.clear()
+            _pending_events_ready.clear()
+        _broadcast_event(events)
+
+
+def _refresh_sse_snapshot():
+    """Republish sse_clients for broadcasters; call with sse_clients_lock held."""
+    global sse_clients_snapshot
+    sse_clients_snapshot = tuple(sse_clients)
+
+
+def _broadcast_event(event):
+    """Queue an already-framed SSE event for every connected client."""
+    # No lock: the snapshot is replaced, never mutated, so one read is a consistent view
+    dead = []
+    for n, client_queue in enumerate(sse_clients_snapshot, 1):
+        if n % BROADCAST_BATCH_SIZE == 0:
+            time.sleep(0)  # Let streams and requests run between slices of a large fan-out
         try:
-            client_queue.put(message)
-        except:
-            # Remove disconnected clients
-            if client_queue in sse_clients:
-                sse_clients.remove(client_queue)
+            client_queue.put_nowait(event)
+        except queue.Full:
+            dead.append(client_queue)
+
+    if dead:
+        with sse_clients_lock:
+            sse_clients.difference_update(dead)  # Some may have disconnected meanwhile
+            _refresh_sse_snapshot()
+        for client_queue in dead:
+            # Make room for the sentinel that ends the stream; the browser reconnects.
+            # Only the flusher puts to client queues, so the freed slot stays free.
+            try:
+                client_queue.get_nowait()
+            except queue.Empty:
+                pass
+            client_queue.put_nowait(None)
 
 
 @app.route("/api/events")
@@ -500,26 +436,37 @@ def sse_stream():
     """Server-Sent Events endpoint for real-time updates."""
     def event_stream():
         # Create a queue for this client
-        client_queue = queue.Queue()
-        sse_clients.append(client_queue)
+        client_queue = queue.Queue(maxsize=SSE_QUEUE_SIZE)
+        with sse_clients_lock:
+            sse_clients.add(client_queue)
+            _refresh_sse_snapshot()
 
         try:
             # Send initial connection status
-            yield f"data: {json.dumps({'type': 'connection_status', 'connected': ws_connected})}\n\n"
+            yield _STATUS_EVENTS[ws_connected]
 
             # Stream events to this client
             while True:
                 try:
                     # Wait for message with timeout
-                    message = client_queue.get(timeout=30)
-                    yield f"data: {message}\n\n"
+                    event = client_queue.get(timeout=30)
+                    # Drain whatever else is queued so it goes out in one write
+                    batch = [event]
+                    while event is not None and not client_queue.empty():
+                        event = client_queue.get_nowait()
+                        batch.append(event)
+                    if event is None:  # Evicted for falling behind
+                        break
+                    yield batch[0] if len(batch) == 1 else b"".join(batch)
                 except queue.Empty:
                     # Send keepalive comment
-                    yield ": keepalive\n\n"
+                    yield b": keepalive\n\n"
         finally:
             # Remove this client when connection closes
-            if client_queue in sse_clients:
-                sse_clients.remove(client_queue)
+            with sse_clients_lock:
+                if client_queue in sse_clients:  # Not already evicted by a broadcast
+                    sse_clients.remove(client_queue)
+                    _refresh_sse_snapshot()
 
     return Response(
         stream_with_context(event_stream()),
@@ -534,8 +481,11 @@ def sse_stream():
 
 # Start WebSocket bridge thread
 def start_websocket_bridge():
-    """Start the WebSocket to SSE bridge in a background thread."""
-    global ws_thread
+    """Start the WebSocket to SSE bridge and the SSE flusher in background threads."""
+    global ws_thread, flusher_thread
+    if flusher_thread is None or not flusher_thread.is_alive():
+        flusher_thread = threading.Thread(target=sse_flusher, daemon=True)
+        flusher_thread.start()
     if ws_thread is None or not ws_thread.is_alive():
         ws_thread = threading.Thread(target=websocket_to_sse_bridge, daemon=True)
         ws_thread.start()
@@ -543,6 +493,6 @@ def start_websocket_bridge():
 
 
 if __name__ == "__main__":
-    # Start WebSocket bridge before running the app
+    # Development server; production runs under gunicorn (see gunicorn.conf.py)
     start_websocket_bridge()
     app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
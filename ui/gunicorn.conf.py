@@ -0,0 +1,15 @@
+"""Gunicorn settings for the UI service."""
+import os
+
+bind = "0.0.0.0:5000"
+worker_class = "gevent"
+workers = int(os.getenv("UI_WORKERS", "2"))
+worker_connections = 200
+# SSE streams stay open; keep the worker timeout above the 30s keepalive
+timeout = 60
+
+
+def post_worker_init(worker):
+    """Each worker serves its own SSE clients, so each runs its own bridge."""
+    from app import start_websocket_bridge
+    start_websocket_bridge()
@@ -101,7 +101,8 @@ WorkingDirectory=$UI_DIR
 Environment="PATH=$UI_DIR/venv/bin"
 Environment="PYTHONPATH=$PROJECT_ROOT"
 EnvironmentFile=$PROJECT_ROOT/.env
-ExecStart=$UI_DIR/venv/bin/python app.py
+Environment="UI_GEVENT=1"
+ExecStart=$UI_DIR/venv/bin/gunicorn -c gunicorn.conf.py app:app
 Restart=always
 RestartSec=10
 
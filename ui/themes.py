@@ -372,8 +372,8 @@ def get_theme(theme_id: str):
     return THEMES.get(theme_id, THEMES[DEFAULT_THEME])
 
 
-def get_all_themes():
-    """Get all available themes organized by category."""
+def _group_by_category():
+    """Build the category -> theme list mapping served by get_all_themes."""
     categories = {}
     for theme_id, theme_data in THEMES.items():
         category = theme_data["category"]
@@ -385,3 +385,12 @@ def get_all_themes():
             "colors": theme_data["colors"]
         })
     return categories
+
+
+# THEMES never changes at runtime, so the grouping is built once at import
+_THEMES_BY_CATEGORY = _group_by_category()
+
+
+def get_all_themes():
+    """Get all available themes organized by category (shared; do not modify)."""
+    return _THEMES_BY_CATEGORY